@@ -0,0 +1,148 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+_cycle_dfs.pyx — AOT-compiled cycle search kernel
+
+Cython twin of cycle_detector._cycle_kernel for hosts where Numba's LLVM
+dependency is unwanted: no JIT warmup and a small artifact. Same inputs,
+same outputs. Build in place with:
+
+    cythonize -i -3 backend/_cycle_dfs.pyx
+
+cycle_detector imports it when present and falls back otherwise.
+"""
+
+import numpy as np
+
+from libc.stdint cimport int8_t, int32_t, int64_t
+
+cdef enum:
+    MAX_DEPTH = 8
+
+
+cdef inline Py_ssize_t _first_at_least(
+    const int32_t[:] values, Py_ssize_t lo, Py_ssize_t hi, int32_t key
+) nogil:
+    """Binary search: first index in [lo, hi) with values[i] >= key."""
+    cdef Py_ssize_t mid
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if values[mid] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def find_cycles(
+    const int32_t[:] indptr,
+    const int32_t[:] neighbors,
+    const double[:] edge_amount,
+    const int64_t[:] edge_ts,
+    const int32_t[:] edge_pos,
+    const int32_t[:] starts,
+    int min_len,
+    int max_len,
+    double max_span_hours,
+    double max_ratio,
+):
+    """
+    Iterative bounded DFS over receiver-sorted CSR arrays.
+
+    Returns (nodes[count, max_len], edges[count, max_len], lengths[count],
+    count); edge rows hold original edge positions padded with -1.
+    """
+    if max_len > MAX_DEPTH:
+        raise ValueError(f"max_len {max_len} exceeds compiled limit {MAX_DEPTH}")
+
+    cdef Py_ssize_t n = indptr.shape[0] - 1
+    cdef Py_ssize_t cap = 64
+    cdef Py_ssize_t count = 0
+    out_nodes_arr = np.empty((cap, max_len), dtype=np.int32)
+    out_edges_arr = np.full((cap, max_len), -1, dtype=np.int32)
+    out_len_arr = np.empty(cap, dtype=np.int8)
+    cdef int32_t[:, :] out_nodes = out_nodes_arr
+    cdef int32_t[:, :] out_edges = out_edges_arr
+    cdef int8_t[:] out_len = out_len_arr
+
+    on_path_arr = np.zeros(n, dtype=np.int8)
+    cdef int8_t[:] on_path = on_path_arr
+
+    cdef int32_t path_nodes[MAX_DEPTH]
+    cdef int32_t path_edges[MAX_DEPTH]
+    cdef Py_ssize_t cursor[MAX_DEPTH]
+    cdef int64_t min_ts[MAX_DEPTH]
+    cdef int64_t max_ts[MAX_DEPTH]
+    cdef double min_amt[MAX_DEPTH]
+    cdef double max_amt[MAX_DEPTH]
+
+    cdef Py_ssize_t s_i, e, k
+    cdef int depth
+    cdef int32_t start, cur, nb
+    cdef int64_t lo_t, hi_t
+    cdef double lo_a, hi_a, span_hours
+
+    for s_i in range(starts.shape[0]):
+        start = starts[s_i]
+        path_nodes[0] = start
+        on_path[start] = 1
+        cursor[0] = _first_at_least(neighbors, indptr[start], indptr[start + 1], start)
+        min_ts[0] = 9223372036854775807
+        max_ts[0] = -9223372036854775807 - 1
+        min_amt[0] = float("inf")
+        max_amt[0] = float("-inf")
+        depth = 1
+
+        while depth > 0:
+            cur = path_nodes[depth - 1]
+            e = cursor[depth - 1]
+            if e == indptr[cur + 1]:
+                on_path[cur] = 0
+                depth -= 1
+                continue
+            cursor[depth - 1] = e + 1
+
+            nb = neighbors[e]
+            lo_t = min(min_ts[depth - 1], edge_ts[e])
+            hi_t = max(max_ts[depth - 1], edge_ts[e])
+            span_hours = (hi_t - lo_t) / 3600.0
+            lo_a = min(min_amt[depth - 1], edge_amount[e])
+            hi_a = max(max_amt[depth - 1], edge_amount[e])
+            # Span and ratio only grow along a path, so both prune subtrees
+            if span_hours > max_span_hours:
+                continue
+            if lo_a == 0 or hi_a / lo_a > max_ratio:
+                continue
+
+            if nb == start and depth >= min_len:
+                if count == cap:
+                    cap *= 2
+                    out_nodes_arr = np.resize(out_nodes_arr, (cap, max_len))
+                    grown_edges = np.full((cap, max_len), -1, dtype=np.int32)
+                    grown_edges[:count] = out_edges_arr[:count]
+                    out_edges_arr = grown_edges
+                    out_len_arr = np.resize(out_len_arr, cap)
+                    out_nodes = out_nodes_arr
+                    out_edges = out_edges_arr
+                    out_len = out_len_arr
+                for k in range(depth):
+                    out_nodes[count, k] = path_nodes[k]
+                for k in range(depth - 1):
+                    out_edges[count, k] = path_edges[k]
+                out_edges[count, depth - 1] = edge_pos[e]
+                out_len[count] = depth
+                count += 1
+                continue
+
+            # Extend path (no revisiting)
+            if on_path[nb] == 0 and depth < max_len:
+                path_edges[depth - 1] = edge_pos[e]
+                path_nodes[depth] = nb
+                on_path[nb] = 1
+                cursor[depth] = _first_at_least(neighbors, indptr[nb], indptr[nb + 1], start)
+                min_ts[depth] = lo_t
+                max_ts[depth] = hi_t
+                min_amt[depth] = lo_a
+                max_amt[depth] = hi_a
+                depth += 1
+
+    return out_nodes_arr, out_edges_arr, out_len_arr, count
@@ -11,6 +11,9 @@ structural_confidence = 0.4 * temporal_score
                       + 0.3 * tightness_score
 
 Clamped to [0, 1].
+
+compute_confidences_batch evaluates the temporal and amount sub-scores for
+all rings in one vectorized pass over a flattened (ring, ts, amount) table.
 """
 
 from __future__ import annotations
@@ -18,6 +21,8 @@ from __future__ import annotations
 from datetime import timedelta
 from typing import Dict, List
 
+import numpy as np
+
 from backend.graph_builder import GraphData, Transaction
 
 MAX_TIME_SPAN_HOURS = 72.0
@@ -38,6 +43,89 @@ def compute_structural_confidence(
     return round(max(0.0, min(1.0, confidence)), 4)
 
 
+def compute_confidences_batch(
+    rings: List[dict],
+    graph: GraphData,
+) -> List[float]:
+    """
+    Vectorized compute_structural_confidence over many rings.
+
+    Returns one confidence per ring, in input order.
+    """
+    if not rings:
+        return []
+
+    lengths = np.fromiter((len(r.get("transactions", [])) for r in rings), dtype=np.int64, count=len(rings))
+    offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    flat_txs = [tx for r in rings for tx in r.get("transactions", [])]
+    ts = np.fromiter((tx.ts_epoch for tx in flat_txs), dtype=np.float64, count=len(flat_txs))
+    amt = np.fromiter((tx.amount for tx in flat_txs), dtype=np.float64, count=len(flat_txs))
+
+    temporal = np.ones(len(rings), dtype=np.float64)
+    amount = np.ones(len(rings), dtype=np.float64)
+
+    # reduceat is undefined for empty segments; those rings keep score 1.0
+    nonempty = lengths > 0
+    if nonempty.any():
+        seg = offsets[:-1][nonempty]
+        span_hours = (np.maximum.reduceat(ts, seg) - np.minimum.reduceat(ts, seg)) / 3600.0
+        temporal[nonempty] = np.maximum(0.0, 1.0 - (span_hours / MAX_TIME_SPAN_HOURS))
+
+        a_min = np.minimum.reduceat(amt, seg)
+        a_max = np.maximum.reduceat(amt, seg)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = a_max / a_min
+        amount[nonempty] = np.where(a_min == 0, 0.0, np.maximum(0.0, 1.0 - (ratio - 1.0)))
+
+    # Cycles carry a pre-rounded amount_ratio which takes precedence
+    for i, ring in enumerate(rings):
+        if "amount_ratio" in ring:
+            amount[i] = max(0.0, 1.0 - (ring["amount_ratio"] - 1.0))
+
+    tightness = _tightness_batch(rings, graph)
+
+    confidence = 0.4 * temporal + 0.3 * amount + 0.3 * tightness
+    return [round(max(0.0, min(1.0, float(c))), 4) for c in confidence]
+
+
+def _tightness_batch(rings: List[dict], graph: GraphData) -> np.ndarray:
+    """
+    Vectorized _tightness_score: one degree vector per request, per-ring
+    intermediate degree sums via np.add.reduceat.
+    """
+    csr = graph.csr
+    if csr is None:
+        return np.fromiter((_tightness_score(r, graph) for r in rings), dtype=np.float64, count=len(rings))
+
+    tightness = np.ones(len(rings), dtype=np.float64)
+    degree_vec = csr.degree
+
+    ring_pos: List[int] = []
+    counts: List[int] = []
+    flat_intermediates: List[int] = []
+    for i, ring in enumerate(rings):
+        if "tightness_score" in ring:
+            tightness[i] = ring["tightness_score"]
+            continue
+        intermediates = ring.get("members", [])[1:-1]
+        if not intermediates:
+            continue
+        ring_pos.append(i)
+        counts.append(len(intermediates))
+        flat_intermediates.extend(csr.node_to_idx[m] for m in intermediates)
+
+    if ring_pos:
+        offsets = np.zeros(len(counts), dtype=np.int64)
+        np.cumsum(counts[:-1], out=offsets[1:])
+        totals = np.add.reduceat(degree_vec[np.asarray(flat_intermediates, dtype=np.int64)], offsets)
+        avg_deg = totals / np.asarray(counts, dtype=np.int64)
+        with np.errstate(divide="ignore"):
+            tight = np.where(avg_deg == 0, 1.0, np.minimum(1.0, 1.0 / avg_deg))
+        tightness[ring_pos] = tight
+    return tightness
+
+
 # ── Sub-scores ────────────────────────────────────────────────────
 
 def _temporal_score(ring: dict) -> float:
@@ -45,8 +133,8 @@ def _temporal_score(ring: dict) -> float:
     txs: List[Transaction] = ring.get("transactions", [])
     if not txs:
         return 1.0
-    timestamps = [tx.timestamp for tx in txs]
-    span_hours = (max(timestamps) - min(timestamps)).total_seconds() / 3600.0
+    timestamps = [tx.ts_epoch for tx in txs]
+    span_hours = (max(timestamps) - min(timestamps)) / 3600.0
     return max(0.0, 1.0 - (span_hours / MAX_TIME_SPAN_HOURS))
 
 
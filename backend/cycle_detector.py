@@ -2,25 +2,50 @@
 cycle_detector.py — Cycle Detection (Circular Routing)
 
 Algorithm:
-  - Custom bounded DFS, depth 3–5
+  - Custom bounded DFS, depth 3–5, over the CSR view: the AOT Cython
+    kernel (_cycle_dfs) when built, else the Numba-jitted kernel, else a
+    pure-Python fallback over adj_list
   - Time constraint: span ≤72 hours
   - Amount ratio check: max/min ≤1.25
   - Canonicalization: rotate cycle to start at lexicographically smallest node
   - Deduplication of canonical cycles
   - Returns structured ring objects
+
+Set RIFT_PARALLEL (worker count, or any non-numeric value for one per CPU)
+to fan the compiled search out over a process pool, partitioned by start
+node. Off by default: serverless hosts run a single process.
 """
 
 from __future__ import annotations
 
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
 from typing import Dict, List, Set, Tuple
 
+import numpy as np
+
 from backend.graph_builder import GraphData, Transaction
+from backend.numba_compat import HAS_NUMBA, njit
+
+try:
+    from backend._cycle_dfs import find_cycles as _cycle_kernel_c
+except ImportError:
+    _cycle_kernel_c = None
 
 MAX_CYCLE_LEN = 5
 MIN_CYCLE_LEN = 3
 MAX_TIME_SPAN_HOURS = 72
 MAX_AMOUNT_RATIO = 1.25
+MIN_PARALLEL_STARTS = 512  # below this, pool dispatch costs more than it saves
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers = 0
+# Guards pool creation and task submission across request threads
+_executor_lock = threading.Lock()
 
 
 def detect_cycles(graph: GraphData) -> List[dict]:
@@ -28,6 +53,13 @@ def detect_cycles(graph: GraphData) -> List[dict]:
     Find all directed cycles of length 3–5 satisfying time/amount constraints.
     Optimized with canonical pruning and degree filtering.
     """
+    # A cycle of MIN_CYCLE_LEN needs that many distinct nodes and edges
+    if len(graph.all_nodes) < MIN_CYCLE_LEN or len(graph.transactions) < MIN_CYCLE_LEN:
+        return []
+
+    if (_cycle_kernel_c is not None or HAS_NUMBA) and graph.csr is not None:
+        return _detect_cycles_csr(graph)
+
     seen_canonical: Set[tuple] = set()
     results: List[dict] = []
 
@@ -37,38 +69,378 @@ def detect_cycles(graph: GraphData) -> List[dict]:
         if graph.node_stats[n].in_degree > 0 and graph.node_stats[n].out_degree > 0
     ]
 
+    # Depth-specialized nested loops for the default 3–5 bounds
+    if (MIN_CYCLE_LEN, MAX_CYCLE_LEN) == (3, 5):
+        for start_node in sorted(candidate_starts):
+            _find_cycles_unrolled(graph, start_node, seen_canonical, results)
+        return results
+
     for start_node in sorted(candidate_starts):
-        _dfs(
-            graph=graph,
-            path=[start_node],
-            tx_path=[],
-            start=start_node,
-            seen_canonical=seen_canonical,
-            results=results,
-        )
+        _dfs(graph, start_node, seen_canonical, results)
 
     return results
 
 
 # ── Private helpers ───────────────────────────────────────────────
 
-def _dfs(
+def _detect_cycles_csr(graph: GraphData) -> List[dict]:
+    """Run the compiled DFS kernel over the CSR view and convert rows back to ring dicts."""
+    csr = graph.csr
+    in_deg = np.diff(csr.in_indptr)
+    out_deg = np.diff(csr.indptr)
+    # Index order == lexicographic order, so this matches sorted(candidate_starts)
+    starts = np.flatnonzero((in_deg > 0) & (out_deg > 0)).astype(np.int32)
+
+    order = csr.recv_order
+    arrays = (csr.indptr, csr.neighbors[order], csr.edge_amount[order], csr.edge_ts[order], order)
+    workers = _parallel_workers()
+    if workers > 1 and len(starts) >= MIN_PARALLEL_STARTS:
+        cyc_nodes, cyc_edges, cyc_len, count = _run_kernel_parallel(arrays, starts, workers)
+    else:
+        cyc_nodes, cyc_edges, cyc_len, count = _run_kernel(arrays, starts)
+
+    # The kernel walks receiver-sorted neighbours; DFS preorder over the
+    # original edge order is the lexicographic order of edge positions.
+    rows = np.lexsort(cyc_edges[:count].T[::-1])
+
+    seen_canonical: Set[tuple] = set()
+    results: List[dict] = []
+    for row in rows:
+        length = int(cyc_len[row])
+        canon = tuple(csr.node_ids[i] for i in cyc_nodes[row, :length])
+        # Parallel edges can close the same node sequence more than once
+        if canon in seen_canonical:
+            continue
+        seen_canonical.add(canon)
+        tx_path = [graph.transactions[csr.out_edges[e]] for e in cyc_edges[row, :length]]
+        results.append({
+            "pattern_type": "cycle",
+            "members": list(canon),
+            "transactions": tx_path,
+            "cycle_length": length,
+            "time_span_hours": round(_time_span_hours(tx_path), 2),
+            "amount_ratio": round(_amount_ratio(tx_path), 4),
+        })
+    return results
+
+
+def _run_kernel(arrays: tuple, starts: np.ndarray) -> tuple:
+    """Invoke the cycle kernel (compiled Cython if built, else Numba) on a subset of start nodes."""
+    kernel = _cycle_kernel_c if _cycle_kernel_c is not None else _cycle_kernel
+    return kernel(
+        *arrays, starts,
+        MIN_CYCLE_LEN, MAX_CYCLE_LEN, float(MAX_TIME_SPAN_HOURS), MAX_AMOUNT_RATIO,
+    )
+
+
+def _run_kernel_parallel(arrays: tuple, starts: np.ndarray, workers: int) -> tuple:
+    """
+    Split start nodes across a process pool and concatenate the rows.
+
+    Searches from different start nodes share no state, and the caller
+    re-sorts rows by edge position, so the partition does not affect
+    output. Starts are strided since low indices carry the most work.
+    """
+    chunks = [starts[i::workers] for i in range(workers)]
+    # map() submits every chunk before returning, so a concurrent resize
+    # cannot shut the pool down between lookup and submission
+    with _executor_lock:
+        results = _get_executor(workers).map(_run_kernel, [arrays] * workers, chunks)
+    parts = list(results)
+    return (
+        np.concatenate([nodes[:count] for nodes, _, _, count in parts]),
+        np.concatenate([edges[:count] for _, edges, _, count in parts]),
+        np.concatenate([lens[:count] for _, _, lens, count in parts]),
+        sum(count for _, _, _, count in parts),
+    )
+
+
+def _parallel_workers() -> int:
+    """Worker count from RIFT_PARALLEL; 0 when unset or disabled."""
+    raw = os.environ.get("RIFT_PARALLEL", "").strip()
+    if not raw or raw == "0":
+        return 0
+    try:
+        return int(raw)
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Reuse one pool across requests; rebuild only if the size changes.
+    Call with _executor_lock held. Workers start from a fork server (spawn
+    where unavailable), never by forking the threaded server process.
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context(method),
+        )
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the parallel search pool, if one was started."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+            _executor_workers = 0
+
+
+@njit(cache=True, nogil=True)
+def _cycle_kernel(indptr, neighbors, edge_amount, edge_ts, edge_pos, starts,
+                  min_len, max_len, max_span_hours, max_ratio):
+    """
+    Iterative bounded DFS mirroring `_dfs`, over int32 CSR arrays.
+
+    Edge arrays are receiver-sorted within each node slice, so canonical
+    pruning (skip neighbours < start) is a searchsorted jump. Running
+    min/max of timestamps and amounts are kept per depth so the time-span
+    and amount-ratio checks are O(1) per edge, and both prune before a path
+    is extended. Emitted edges are original positions via edge_pos, padded
+    with -1. Returns
+    (nodes[count, max_len], edges[count, max_len], lengths[count], count).
+    """
+    n = indptr.shape[0] - 1
+    cap = 64
+    out_nodes = np.empty((cap, max_len), np.int32)
+    out_edges = np.full((cap, max_len), -1, np.int32)
+    out_len = np.empty(cap, np.int8)
+    count = 0
+
+    on_path = np.zeros(n, np.int8)
+    path_nodes = np.empty(max_len, np.int32)
+    path_edges = np.empty(max_len, np.int32)
+    cursor = np.empty(max_len, np.int32)
+    min_ts = np.empty(max_len, np.int64)
+    max_ts = np.empty(max_len, np.int64)
+    min_amt = np.empty(max_len, np.float64)
+    max_amt = np.empty(max_len, np.float64)
+
+    for start in starts:
+        path_nodes[0] = start
+        on_path[start] = 1
+        cursor[0] = indptr[start] + np.searchsorted(neighbors[indptr[start]:indptr[start + 1]], start)
+        min_ts[0] = np.iinfo(np.int64).max
+        max_ts[0] = np.iinfo(np.int64).min
+        min_amt[0] = np.inf
+        max_amt[0] = -np.inf
+        depth = 1
+
+        while depth > 0:
+            cur = path_nodes[depth - 1]
+            e = cursor[depth - 1]
+            if e == indptr[cur + 1]:
+                on_path[cur] = 0
+                depth -= 1
+                continue
+            cursor[depth - 1] = e + 1
+
+            nb = neighbors[e]
+            lo_t = min(min_ts[depth - 1], edge_ts[e])
+            hi_t = max(max_ts[depth - 1], edge_ts[e])
+            span_hours = (hi_t - lo_t) / 3600.0
+            lo_a = min(min_amt[depth - 1], edge_amount[e])
+            hi_a = max(max_amt[depth - 1], edge_amount[e])
+            # Span and ratio only grow along a path, so both prune subtrees
+            if span_hours > max_span_hours:
+                continue
+            if lo_a == 0 or hi_a / lo_a > max_ratio:
+                continue
+
+            if nb == start and depth >= min_len:
+                if count == cap:
+                    cap *= 2
+                    grown_nodes = np.empty((cap, max_len), np.int32)
+                    grown_edges = np.full((cap, max_len), -1, np.int32)
+                    grown_len = np.empty(cap, np.int8)
+                    grown_nodes[:count] = out_nodes[:count]
+                    grown_edges[:count] = out_edges[:count]
+                    grown_len[:count] = out_len[:count]
+                    out_nodes, out_edges, out_len = grown_nodes, grown_edges, grown_len
+                for k in range(depth):
+                    out_nodes[count, k] = path_nodes[k]
+                for k in range(depth - 1):
+                    out_edges[count, k] = path_edges[k]
+                out_edges[count, depth - 1] = edge_pos[e]
+                out_len[count] = depth
+                count += 1
+                continue
+
+            # Extend path (no revisiting)
+            if on_path[nb] == 0 and depth < max_len:
+                path_edges[depth - 1] = edge_pos[e]
+                path_nodes[depth] = nb
+                on_path[nb] = 1
+                lo = indptr[nb]
+                cursor[depth] = lo + np.searchsorted(neighbors[lo:indptr[nb + 1]], start)
+                min_ts[depth] = lo_t
+                max_ts[depth] = hi_t
+                min_amt[depth] = lo_a
+                max_amt[depth] = hi_a
+                depth += 1
+
+    return out_nodes, out_edges, out_len, count
+
+
+def _find_cycles_unrolled(
     graph: GraphData,
-    path: List[str],
-    tx_path: List[Transaction],
     start: str,
     seen_canonical: Set[tuple],
     results: List[dict],
 ) -> None:
-    """Bounded DFS up to depth MAX_CYCLE_LEN."""
-    current = path[-1]
-    depth = len(path)
+    """
+    `_dfs` unrolled into five nested loops for cycles of length 3–5.
+
+    Visits edges in the same order as `_dfs`, so results come out in the
+    same order. Each level carries running min/max of timestamps and
+    amounts and prunes on span and ratio; closures are checked at levels
+    3, 4 and 5.
+    """
+    adj = graph.adj_list
+    max_span = MAX_TIME_SPAN_HOURS * 3600.0
 
-    if depth > MAX_CYCLE_LEN:
+    for t1 in adj.get(start, ()):
+        n1 = t1.receiver
+        if n1 <= start:
+            continue
+        lo_t1 = hi_t1 = t1.ts_epoch
+        lo_a1 = hi_a1 = t1.amount
+        if lo_a1 == 0:
+            continue
+
+        for t2 in adj.get(n1, ()):
+            n2 = t2.receiver
+            if n2 <= start or n2 == n1:
+                continue
+            lo_t2 = min(lo_t1, t2.ts_epoch)
+            hi_t2 = max(hi_t1, t2.ts_epoch)
+            if hi_t2 - lo_t2 > max_span:
+                continue
+            lo_a2 = min(lo_a1, t2.amount)
+            hi_a2 = max(hi_a1, t2.amount)
+            if lo_a2 == 0 or hi_a2 / lo_a2 > MAX_AMOUNT_RATIO:
+                continue
+
+            for t3 in adj.get(n2, ()):
+                n3 = t3.receiver
+                if n3 < start:
+                    continue
+                lo_t3 = min(lo_t2, t3.ts_epoch)
+                hi_t3 = max(hi_t2, t3.ts_epoch)
+                lo_a3 = min(lo_a2, t3.amount)
+                hi_a3 = max(hi_a2, t3.amount)
+                if n3 == start:
+                    _emit_cycle(
+                        (start, n1, n2), (t1, t2, t3),
+                        lo_t3, hi_t3, lo_a3, hi_a3, seen_canonical, results,
+                    )
+                    continue
+                if n3 == n1 or n3 == n2 or hi_t3 - lo_t3 > max_span:
+                    continue
+                if lo_a3 == 0 or hi_a3 / lo_a3 > MAX_AMOUNT_RATIO:
+                    continue
+
+                for t4 in adj.get(n3, ()):
+                    n4 = t4.receiver
+                    if n4 < start:
+                        continue
+                    lo_t4 = min(lo_t3, t4.ts_epoch)
+                    hi_t4 = max(hi_t3, t4.ts_epoch)
+                    lo_a4 = min(lo_a3, t4.amount)
+                    hi_a4 = max(hi_a3, t4.amount)
+                    if n4 == start:
+                        _emit_cycle(
+                            (start, n1, n2, n3), (t1, t2, t3, t4),
+                            lo_t4, hi_t4, lo_a4, hi_a4, seen_canonical, results,
+                        )
+                        continue
+                    if n4 == n1 or n4 == n2 or n4 == n3 or hi_t4 - lo_t4 > max_span:
+                        continue
+                    if lo_a4 == 0 or hi_a4 / lo_a4 > MAX_AMOUNT_RATIO:
+                        continue
+
+                    # Depth 5: only closures, no further extension
+                    for t5 in adj.get(n4, ()):
+                        if t5.receiver != start:
+                            continue
+                        _emit_cycle(
+                            (start, n1, n2, n3, n4), (t1, t2, t3, t4, t5),
+                            min(lo_t4, t5.ts_epoch), max(hi_t4, t5.ts_epoch),
+                            min(lo_a4, t5.amount), max(hi_a4, t5.amount),
+                            seen_canonical, results,
+                        )
+
+
+def _emit_cycle(
+    members: tuple,
+    txs: tuple,
+    lo_ts: float,
+    hi_ts: float,
+    lo_amt: float,
+    hi_amt: float,
+    seen_canonical: Set[tuple],
+    results: List[dict],
+) -> None:
+    """Validate a closed path from its running bounds and record it once."""
+    span_hours = (hi_ts - lo_ts) / 3600.0
+    if span_hours > MAX_TIME_SPAN_HOURS:
+        return
+    ratio = hi_amt / lo_amt if lo_amt != 0 else float("inf")
+    if ratio > MAX_AMOUNT_RATIO or members in seen_canonical:
         return
+    seen_canonical.add(members)
+    results.append({
+        "pattern_type": "cycle",
+        "members": list(members),
+        "transactions": list(txs),
+        "cycle_length": len(members),
+        "time_span_hours": round(span_hours, 2),
+        "amount_ratio": round(ratio, 4),
+    })
+
+
+def _dfs(
+    graph: GraphData,
+    start: str,
+    seen_canonical: Set[tuple],
+    results: List[dict],
+) -> None:
+    """
+    Bounded DFS up to depth MAX_CYCLE_LEN from `start`.
+
+    Iterative: an explicit stack of adjacency iterators replaces recursion,
+    with path, path_set, tx_path and the running min/max of timestamps and
+    amounts (one tuple per depth) kept as locals, so span and ratio checks
+    are O(1) per edge.
+    """
+    adj = graph.adj_list
+    path: List[str] = [start]
+    path_set: Set[str] = {start}
+    tx_path: List[Transaction] = []
+    bounds: List[Tuple[float, float, float, float]] = [(math.inf, -math.inf, math.inf, -math.inf)]
+    stack = [iter(adj.get(start, ()))]
+
+    while stack:
+        tx = next(stack[-1], None)
+        if tx is None:
+            # Edges of the deepest node exhausted: backtrack
+            stack.pop()
+            if tx_path:
+                path_set.remove(path.pop())
+                tx_path.pop()
+                bounds.pop()
+            continue
 
-    for tx in graph.adj_list.get(current, []):
         neighbour = tx.receiver
+        depth = len(path)
 
         # ── Canonical Pruning ──
         # If we see a node smaller than start, this cycle is (or will be)
@@ -76,56 +448,51 @@ def _dfs(
         if neighbour < start:
             continue
 
+        min_ts, max_ts, min_amt, max_amt = bounds[-1]
+        lo_ts = min(min_ts, tx.ts_epoch)
+        hi_ts = max(max_ts, tx.ts_epoch)
+        span_hours = (hi_ts - lo_ts) / 3600.0
+        lo_amt = min(min_amt, tx.amount)
+        hi_amt = max(max_amt, tx.amount)
+
         # ── Cycle found? ──
         if neighbour == start and depth >= MIN_CYCLE_LEN:
-            tx_path.append(tx)
-            if _validate_cycle(tx_path):
+            ratio = hi_amt / lo_amt if lo_amt != 0 else float("inf")
+            if span_hours <= MAX_TIME_SPAN_HOURS and ratio <= MAX_AMOUNT_RATIO:
                 # Since we start from min node and never visit smaller nodes,
                 # the path itself is already canonical.
                 canon = tuple(path)
                 if canon not in seen_canonical:
                     seen_canonical.add(canon)
-                    time_span = _time_span_hours(tx_path)
-                    ratio = _amount_ratio(tx_path)
                     results.append({
                         "pattern_type": "cycle",
                         "members": list(path),
-                        "transactions": list(tx_path),
+                        "transactions": tx_path + [tx],
                         "cycle_length": len(path),
-                        "time_span_hours": round(time_span, 2),
+                        "time_span_hours": round(span_hours, 2),
                         "amount_ratio": round(ratio, 4),
                     })
-            tx_path.pop()
             continue
 
         # ── Extend path (no revisiting) ──
-        if neighbour not in path and depth < MAX_CYCLE_LEN:
-            tx_path.append(tx)
-            # Early pruning: check time so far
-            if _time_span_hours(tx_path) <= MAX_TIME_SPAN_HOURS:
+        if neighbour not in path_set and depth < MAX_CYCLE_LEN:
+            # Early pruning: span and ratio can only grow along the path
+            if lo_amt == 0 or hi_amt / lo_amt > MAX_AMOUNT_RATIO:
+                continue
+            if span_hours <= MAX_TIME_SPAN_HOURS:
+                tx_path.append(tx)
                 path.append(neighbour)
-                _dfs(graph, path, tx_path, start, seen_canonical, results)
-                path.pop()
-            tx_path.pop()
-
-
-
-def _validate_cycle(txs: List[Transaction]) -> bool:
-    """Check time span ≤72h and amount ratio ≤1.25."""
-    if _time_span_hours(txs) > MAX_TIME_SPAN_HOURS:
-        return False
-    if _amount_ratio(txs) > MAX_AMOUNT_RATIO:
-        return False
-    return True
+                path_set.add(neighbour)
+                bounds.append((lo_ts, hi_ts, lo_amt, hi_amt))
+                stack.append(iter(adj.get(neighbour, ())))
 
 
 def _time_span_hours(txs: List[Transaction]) -> float:
     """Total time span of the transaction list in hours."""
     if not txs:
         return 0.0
-    timestamps = [tx.timestamp for tx in txs]
-    span = max(timestamps) - min(timestamps)
-    return span.total_seconds() / 3600.0
+    timestamps = [tx.ts_epoch for tx in txs]
+    return (max(timestamps) - min(timestamps)) / 3600.0
 
 
 def _amount_ratio(txs: List[Transaction]) -> float:
@@ -6,6 +6,11 @@ After suspicious accounts are identified:
 
 If density < 0.3  →  multiply score by 0.8 (adjusted down).
 Must be computed after all rings are formed.
+
+Neighbour sets are built over interned node indices from the CSR view:
+each (account, neighbour) pair is encoded as one int64 and deduplicated
+with np.unique. Suspicious membership is a packed uint64 bitset tested
+with shift/AND, and hits are counted per account with np.bincount.
 """
 
 from __future__ import annotations
@@ -13,6 +18,8 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Dict, Set
 
+import numpy as np
+
 from backend.graph_builder import GraphData
 
 DENSITY_THRESHOLD = 0.3
@@ -27,17 +34,20 @@ def compute_density_adjustments(
     Return a dict  { account_id → density_multiplier }.
     Multiplier is 0.8 when local anomaly density < 0.3, else 1.0.
     """
+    if graph.csr is not None:
+        return _density_adjustments_csr(suspicious_accounts, graph)
+
     adjustments: Dict[str, float] = {}
 
     for account in suspicious_accounts:
         neighbors: Set[str] = set()
 
         # Outgoing neighbors
-        for tx in graph.adj_list.get(account, []):
+        for tx in graph.adj_list.get(account, ()):
             neighbors.add(tx.receiver)
 
         # Incoming neighbors
-        for tx in graph.reverse_adj_list.get(account, []):
+        for tx in graph.reverse_adj_list.get(account, ()):
             neighbors.add(tx.sender)
 
         if not neighbors:
@@ -54,3 +64,45 @@ def compute_density_adjustments(
             adjustments[account] = 1.0
 
     return adjustments
+
+
+def _density_adjustments_csr(
+    suspicious_accounts: Set[str],
+    graph: GraphData,
+) -> Dict[str, float]:
+    """compute_density_adjustments over int node indices."""
+    csr = graph.csr
+    n = len(csr.node_ids)
+    sus_idx = np.fromiter(
+        (csr.node_to_idx[a] for a in suspicious_accounts if a in csr.node_to_idx),
+        dtype=np.int64,
+    )
+    sus_bits = np.zeros((n + 63) >> 6, dtype=np.uint64)
+    np.bitwise_or.at(sus_bits, sus_idx >> 6, np.left_shift(np.uint64(1), (sus_idx & 63).astype(np.uint64)))
+
+    # Undirected (owner, neighbour) pairs, deduplicated
+    senders = csr.sender_idx.astype(np.int64)
+    receivers = csr.receiver_idx.astype(np.int64)
+    pairs = np.unique(np.concatenate((senders * n + receivers, receivers * n + senders)))
+    owner, neighbour = np.divmod(pairs, n)
+    keep = _test_bits(sus_bits, owner)
+    owner, neighbour = owner[keep], neighbour[keep]
+
+    total = np.bincount(owner, minlength=n)
+    suspicious = np.bincount(owner[_test_bits(sus_bits, neighbour)], minlength=n)
+
+    adjustments: Dict[str, float] = {}
+    for account in suspicious_accounts:
+        idx = csr.node_to_idx.get(account)
+        if idx is None or total[idx] == 0:
+            adjustments[account] = DENSITY_MULTIPLIER
+            continue
+        density = int(suspicious[idx]) / int(total[idx])
+        adjustments[account] = DENSITY_MULTIPLIER if density < DENSITY_THRESHOLD else 1.0
+    return adjustments
+
+
+def _test_bits(bits: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Vectorized bitset membership: (bits[idx >> 6] >> (idx & 63)) & 1."""
+    shift = (idx & 63).astype(np.uint64)
+    return ((bits[idx >> 6] >> shift) & np.uint64(1)).astype(bool)
@@ -3,10 +3,14 @@ graph_builder.py — CSV Ingestion + Graph Construction Module
 
 Responsibilities:
   - Strict column validation
+  - Bulk column parsing with pyarrow's multithreaded reader or pandas
+    (csv.reader fallback when unavailable)
   - Datetime parsing with timezone normalization
-  - Float coercion for amounts
+  - Float coercion for amounts (finite, non-negative; same literals as float())
   - Reject malformed rows
   - Build adj_list, reverse_adj_list, node_stats, transaction_list
+  - Intern node ids (shared str objects, plus int32 indices in the CSR view)
+  - Build an int-indexed CSR view of the adjacency list for JIT kernels
   - Transaction count check (≤10K)
 """
 
@@ -14,27 +18,63 @@ from __future__ import annotations
 
 import csv
 import io
+import math
+import mmap
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
 
 REQUIRED_COLUMNS = ["transaction_id", "sender_id", "receiver_id", "amount", "timestamp"]
 MAX_TRANSACTIONS = 13_000
+_TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S")
+_STREAM_ENCODINGS = ("utf-8-sig", "latin-1")
+_ARROW_BLOCK_SIZE = 1 << 20
+
+_EPOCH = pd.Timestamp(0, tz="UTC") if pd is not None else None
 
 
 # ── Data classes ───────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     transaction_id: str
     sender: str
     receiver: str
     amount: float
     timestamp: datetime
+    ts_epoch: float = field(init=False)  # UTC epoch seconds, cached for arithmetic
+    timestamp_ms: int = field(init=False)  # UTC epoch milliseconds, as sent on the wire
+    _iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        self.ts_epoch = self.timestamp.timestamp()
+        self.timestamp_ms = round(self.ts_epoch * 1000)
 
-@dataclass
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO 8601 timestamp, formatted on first use and then cached."""
+        iso = self._iso
+        if iso is None:
+            iso = self._iso = self.timestamp.isoformat()
+        return iso
+
+
+@dataclass(slots=True)
 class NodeStats:
     in_degree: int = 0
     out_degree: int = 0
@@ -47,14 +87,63 @@ class NodeStats:
         return self.in_degree + self.out_degree
 
 
+@dataclass
+class CSRGraph:
+    """
+    Integer-indexed, column-oriented (SoA) view of the graph.
+
+    Node indices follow the lexicographic order of node ids, so integer
+    comparisons match string comparisons. Per-transaction columns are in
+    GraphData.transactions order; the CSR edge lists of each node keep that
+    order too.
+    """
+    node_ids: List[str]          # idx → node id
+    node_to_idx: Dict[str, int]  # node id → idx
+
+    # Per-transaction columns
+    sender_idx: np.ndarray       # int32[m]
+    receiver_idx: np.ndarray     # int32[m]
+    amount: np.ndarray           # float64[m]
+    ts_epoch: np.ndarray         # int64[m]   UTC epoch seconds
+
+    # Outgoing CSR: tx indices of node i are out_edges[indptr[i]:indptr[i + 1]]
+    indptr: np.ndarray           # int32[n + 1]
+    out_edges: np.ndarray        # int32[m]
+    # Incoming CSR, same layout keyed by receiver
+    in_indptr: np.ndarray        # int32[n + 1]
+    in_edges: np.ndarray         # int32[m]
+
+    # Columns gathered in out_edges order, contiguous for the JIT kernels
+    neighbors: np.ndarray        # int32[m]   receiver idx per edge
+    edge_amount: np.ndarray      # float64[m]
+    edge_ts: np.ndarray          # int64[m]
+    # Out-CSR edge positions re-ordered by receiver idx within each node
+    # slice (stable), for searchsorted jumps over neighbour ranges
+    recv_order: np.ndarray       # int32[m]
+    # Per-node in + out transaction count (NodeStats.total_degree by idx)
+    degree: np.ndarray           # int32[n]
+    # out_edges / in_edges re-ordered by timestamp within each node slice
+    # (stable, so ties keep transaction order)
+    out_by_time: np.ndarray      # int32[m]
+    in_by_time: np.ndarray       # int32[m]
+
+
 @dataclass
 class GraphData:
     """Container for the entire parsed graph."""
     transactions: List[Transaction]
-    adj_list: Dict[str, List[Transaction]]
-    reverse_adj_list: Dict[str, List[Transaction]]
+    adj_list: Dict[str, Tuple[Transaction, ...]]
+    reverse_adj_list: Dict[str, Tuple[Transaction, ...]]
     node_stats: Dict[str, NodeStats]
     all_nodes: set
+    csr: Optional[CSRGraph] = None
+
+    @property
+    def sorted_nodes(self) -> List[str]:
+        """Node ids in lexicographic order, i.e. interned index order."""
+        if self.csr is not None:
+            return self.csr.node_ids
+        return sorted(self.all_nodes)
 
 
 # ── Parsing & validation ──────────────────────────────────────────
@@ -62,7 +151,20 @@ class GraphData:
 def _parse_timestamp(raw: str) -> datetime:
     """Parse YYYY-MM-DD HH:MM:SS → UTC datetime."""
     raw = raw.strip()
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"):
+    # Fast path: fromisoformat is C-implemented. Only take it for the exact
+    # 19-char shapes of the accepted formats (it also accepts offsets, week
+    # dates, etc., which stay rejected by strptime below).
+    if (
+        len(raw) == 19 and raw[10] in " T"
+        and raw[4] == "-" and raw[7] == "-" and raw[13] == ":" and raw[16] == ":"
+    ):
+        try:
+            dt = datetime.fromisoformat(raw)
+            if dt.tzinfo is None:
+                return dt.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    for fmt in _TIMESTAMP_FORMATS:
         try:
             dt = datetime.strptime(raw, fmt)
             return dt.replace(tzinfo=timezone.utc)
@@ -75,6 +177,8 @@ def _parse_amount(raw: str) -> float:
     """Coerce to float; raise on failure."""
     try:
         val = float(raw.strip())
+        if not math.isfinite(val):
+            raise ValueError("Non-finite amount")
         if val < 0:
             raise ValueError("Negative amount")
         return val
@@ -82,56 +186,280 @@ def _parse_amount(raw: str) -> float:
         raise ValueError(f"Invalid amount '{raw}': {exc}")
 
 
-def parse_csv(file_content: str) -> GraphData:
+def parse_csv(file_content: Union[str, bytes]) -> GraphData:
     """
-    Parse raw CSV text into a fully constructed GraphData.
+    Parse raw CSV text (or undecoded bytes) into a fully constructed GraphData.
 
     Raises ValueError for:
       - Missing / extra columns
       - >10 000 rows
       - Malformed individual rows (logged & skipped)
+
+    Rows repeating an earlier transaction_id are skipped, so
+    GraphData.transactions holds unique ids.
     """
+    if isinstance(file_content, bytes):
+        return parse_csv_stream(io.BytesIO(file_content))
     # Strip BOM if present
     file_content = file_content.lstrip('\ufeff')
-    reader = csv.DictReader(io.StringIO(file_content))
+    if pd is not None:
+        transactions = _parse_rows_pandas(io.StringIO(file_content))
+    else:
+        transactions = _parse_rows(io.StringIO(file_content))
+    return graph_from_transactions(transactions)
 
-    # ── Column validation ──
-    if reader.fieldnames is None:
-        raise ValueError("CSV file is empty or has no header row.")
-    headers = [h.strip().strip('\ufeff').lower() for h in reader.fieldnames]
+
+def parse_csv_stream(fileobj: BinaryIO) -> GraphData:
+    """
+    Parse a binary CSV stream (e.g. an upload's spooled file) incrementally,
+    without materialising the payload as bytes and then as str.
+
+    Decodes as UTF-8 (BOM-aware); if the bytes are not valid UTF-8 the
+    stream is rewound and decoded as Latin-1. Same errors as parse_csv.
+    """
+    if pa is not None and pd is not None:
+        transactions = _parse_rows_arrow(fileobj)
+        if transactions is not None:
+            return graph_from_transactions(transactions)
+        fileobj.seek(0)
+
+    for encoding in _STREAM_ENCODINGS:
+        try:
+            return graph_from_transactions(_parse_rows_binary(fileobj, encoding))
+        except UnicodeDecodeError:
+            fileobj.seek(0)
+    raise ValueError("File must be UTF-8 encoded.")
+
+
+def _parse_rows_binary(fileobj: BinaryIO, encoding: str) -> List[Transaction]:
+    """Parse undecoded bytes; pandas decodes inside its C tokenizer."""
+    if pd is not None:
+        return _parse_rows_pandas(fileobj, encoding)
+    text = io.TextIOWrapper(fileobj, encoding=encoding, newline="")
+    try:
+        return _parse_rows(text)
+    finally:
+        # Leave the caller's file open
+        text.detach()
+
+
+def graph_from_transactions(transactions: List[Transaction]) -> GraphData:
+    """Reject empty input and build the graph."""
+    if not transactions:
+        raise ValueError("No valid transactions found in CSV.")
+
+    # ── Build graph structures ──
+    return _build_graph(transactions)
+
+
+def _normalise_headers(header: List[str]) -> List[str]:
+    """Strip/lower header names and check required columns are present."""
+    headers = [h.strip().strip('\ufeff').lower() for h in header]
     missing = set(REQUIRED_COLUMNS) - set(headers)
     if missing:
         raise ValueError(f"Missing required columns: {sorted(missing)}")
+    return headers
+
+
+def _parse_rows_pandas(
+    source: Union[TextIO, BinaryIO], encoding: Optional[str] = None
+) -> List[Transaction]:
+    """Parse and validate all rows column-wise with pandas' C reader."""
+    try:
+        df = pd.read_csv(
+            source,
+            encoding=encoding,
+            dtype=str,
+            keep_default_na=False,
+            on_bad_lines="skip",
+        )
+    except pd.errors.EmptyDataError:
+        raise ValueError("CSV file is empty or has no header row.")
+
+    df.columns = _normalise_headers([str(c) for c in df.columns])
+    return _frame_transactions(df)
+
+
+def _parse_rows_arrow(fileobj: BinaryIO) -> Optional[List[Transaction]]:
+    """
+    Parse with pyarrow's multithreaded reader; None means fall back.
+
+    Only well-formed UTF-8 input is handled here. Malformed rows, quoted or
+    repeated headers and invalid bytes return None (or make Arrow raise), and
+    the caller rewinds and lets the pandas reader apply its row-skipping,
+    column-mangling and Latin-1 rules.
+
+    Disk-backed streams (a rolled-over upload spool) are memory-mapped and
+    tokenized in place instead of being copied through Python reads.
+    """
+    mapped = _map_file(fileobj)
+    if mapped is None:
+        headers = _arrow_headers(fileobj.readline())
+        table = _arrow_table(fileobj, len(headers)) if headers is not None else None
+    else:
+        # Only the Arrow read sees the mapping. Header checks and row
+        # validation may raise ValueError, and a traceback still holding the
+        # buffer export would make mmap.close() fail and mask that error.
+        with mapped:
+            body_start = mapped.find(b"\n") + 1 or len(mapped)
+            headers = _arrow_headers(mapped[:body_start])
+            table = None
+            if headers is not None:
+                body = pa.BufferReader(pa.py_buffer(mapped).slice(body_start))
+                table = _arrow_table(body, len(headers))
+                body.close()
+                del body
+    if table is None:
+        return None
+
+    df = table.to_pandas()
+    df.columns = headers
+    return _frame_transactions(df)
+
+
+def _map_file(fileobj: BinaryIO) -> Optional[mmap.mmap]:
+    """Read-only mmap of a disk-backed stream, or None (in memory / empty)."""
+    if not getattr(fileobj, "_rolled", True):
+        return None  # SpooledTemporaryFile still held in memory
+    try:
+        return mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+
+def _arrow_headers(header_line: bytes) -> Optional[List[str]]:
+    """Normalised headers from the raw header line, or None to fall back."""
+    try:
+        header = header_line.decode("utf-8-sig").rstrip("\r\n")
+    except UnicodeDecodeError:
+        return None
+    if not header.strip() or '"' in header:
+        return None
+    headers = _normalise_headers(header.split(","))
+    if len(set(headers)) != len(headers):
+        return None  # leave duplicate-column resolution to pandas
+    return headers
+
+
+def _arrow_table(source, n_columns: int) -> Optional[pa.Table]:
+    """Arrow read of the rows in `source` as string columns, or None."""
+    # Positional names: the real headers may carry whitespace/BOM
+    names = [str(i) for i in range(n_columns)]
+    try:
+        return pa_csv.read_csv(
+            source,
+            read_options=pa_csv.ReadOptions(
+                column_names=names,
+                block_size=_ARROW_BLOCK_SIZE,
+                use_threads=True,
+            ),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=dict.fromkeys(names, pa.string()),
+            ),
+        )
+    except pa.ArrowInvalid:
+        return None
+
+
+def _float_or_nan(raw: str) -> float:
+    """float(raw), or NaN where float() rejects it."""
+    try:
+        return float(raw)
+    except ValueError:
+        return math.nan
+
+
+def _frame_transactions(df: pd.DataFrame) -> List[Transaction]:
+    """Validate a frame of raw string columns and build Transactions."""
+    # Last duplicate wins, as with dict keys
+    df = df.loc[:, ~df.columns.duplicated(keep="last")]
+
+    raw_ts = df["timestamp"].str.strip()
+    ts = pd.to_datetime(raw_ts, format="%Y-%m-%d %H:%M:%S", errors="coerce", utc=True)
+    ts = ts.fillna(pd.to_datetime(raw_ts, format="%Y-%m-%dT%H:%M:%S", errors="coerce", utc=True))
+    raw_amount = df["amount"].str.strip()
+    amount = pd.to_numeric(raw_amount, errors="coerce").astype(float)
+    # float() also takes literals to_numeric rejects ("1_000", non-ASCII
+    # digits); retry the few misses so every parser accepts the same rows
+    retry = amount.isna() & raw_amount.notna()
+    if retry.any():
+        amount[retry] = raw_amount[retry].map(_float_or_nan)
+
+    valid = ts.notna() & np.isfinite(amount) & (amount >= 0)
+    for c in ("transaction_id", "sender_id", "receiver_id"):
+        valid &= df[c].notna()
+    # Duplicate transaction ids: keep the first valid occurrence
+    tx_ids = df["transaction_id"].str.strip()
+    dup = tx_ids[valid].duplicated(keep="first")
+    valid[dup[dup].index] = False
+    if int(valid.sum()) > MAX_TRANSACTIONS:
+        raise ValueError(
+            f"Dataset exceeds maximum of {MAX_TRANSACTIONS:,} transactions."
+        )
+
+    epoch = ((ts[valid] - _EPOCH) / pd.Timedelta(seconds=1)).tolist()
+    return [
+        Transaction(
+            transaction_id=tx_id,
+            sender=sender,
+            receiver=receiver,
+            amount=amt,
+            timestamp=datetime.fromtimestamp(sec, timezone.utc),
+        )
+        for tx_id, sender, receiver, amt, sec in zip(
+            tx_ids[valid].tolist(),
+            map(sys.intern, df["sender_id"][valid].str.strip().tolist()),
+            map(sys.intern, df["receiver_id"][valid].str.strip().tolist()),
+            amount[valid].astype(float).tolist(),
+            epoch,
+        )
+    ]
+
+
+def _parse_rows(text: TextIO) -> List[Transaction]:
+    """Row-by-row csv.reader parser, used when pandas is unavailable."""
+    reader = csv.reader(text)
+
+    # ── Column validation ──
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("CSV file is empty or has no header row.")
+    headers = _normalise_headers(header)
+
+    # Resolve column positions once (last duplicate wins, as with dict keys)
+    col = {h: i for i, h in enumerate(headers)}
+    idx_tx, idx_send, idx_recv, idx_amt, idx_ts = (col[c] for c in REQUIRED_COLUMNS)
 
     # ── Row parsing ──
     transactions: List[Transaction] = []
+    seen_tx_ids: set = set()
     skipped = 0
 
-    for idx, row in enumerate(reader):
+    for row in reader:
+        if not row:
+            continue  # blank line
         if len(transactions) >= MAX_TRANSACTIONS:
             raise ValueError(
                 f"Dataset exceeds maximum of {MAX_TRANSACTIONS:,} transactions."
             )
-        # Normalise keys
-        row = {k.strip().lower(): v for k, v in row.items()}
         try:
             tx = Transaction(
-                transaction_id=row["transaction_id"].strip(),
-                sender=row["sender_id"].strip(),
-                receiver=row["receiver_id"].strip(),
-                amount=_parse_amount(row["amount"]),
-                timestamp=_parse_timestamp(row["timestamp"]),
+                transaction_id=row[idx_tx].strip(),
+                sender=sys.intern(row[idx_send].strip()),
+                receiver=sys.intern(row[idx_recv].strip()),
+                amount=_parse_amount(row[idx_amt]),
+                timestamp=_parse_timestamp(row[idx_ts]),
             )
+            if tx.transaction_id in seen_tx_ids:
+                raise ValueError(f"Duplicate transaction_id: {tx.transaction_id}")
+            seen_tx_ids.add(tx.transaction_id)
             transactions.append(tx)
-        except (ValueError, KeyError):
+        except (ValueError, IndexError):
             skipped += 1
             continue
 
-    if not transactions:
-        raise ValueError("No valid transactions found in CSV.")
-
-    # ── Build graph structures ──
-    return _build_graph(transactions)
+    return transactions
 
 
 def _build_graph(transactions: List[Transaction]) -> GraphData:
@@ -158,10 +486,65 @@ def _build_graph(transactions: List[Transaction]) -> GraphData:
         node_stats[tx.receiver].total_in_amount += tx.amount
         node_stats[tx.receiver].timestamps.append(tx.timestamp)
 
+    # Freeze in place rather than copying into plain dicts: without a
+    # default_factory, missing keys raise KeyError instead of inserting.
+    # Adjacency values become tuples, as they are only ever iterated.
+    for adj in (adj_list, reverse_adj_list):
+        adj.default_factory = None
+        for node, txs in adj.items():
+            adj[node] = tuple(txs)
+    node_stats.default_factory = None
+
     return GraphData(
         transactions=transactions,
-        adj_list=dict(adj_list),
-        reverse_adj_list=dict(reverse_adj_list),
-        node_stats=dict(node_stats),
+        adj_list=adj_list,
+        reverse_adj_list=reverse_adj_list,
+        node_stats=node_stats,
         all_nodes=all_nodes,
+        csr=_build_csr(transactions, all_nodes),
     )
+
+
+def _build_csr(transactions: List[Transaction], all_nodes: set) -> CSRGraph:
+    """Intern node ids to int32 and build SoA columns plus in/out CSR."""
+    node_ids = sorted(all_nodes)
+    node_to_idx = {nid: i for i, nid in enumerate(node_ids)}
+
+    m = len(transactions)
+    senders = np.fromiter((node_to_idx[tx.sender] for tx in transactions), dtype=np.int32, count=m)
+    receivers = np.fromiter((node_to_idx[tx.receiver] for tx in transactions), dtype=np.int32, count=m)
+    amounts = np.fromiter((tx.amount for tx in transactions), dtype=np.float64, count=m)
+    ts = np.fromiter((int(tx.ts_epoch) for tx in transactions), dtype=np.int64, count=m)
+
+    indptr, out_edges = _csr_index(senders, len(node_ids))
+    in_indptr, in_edges = _csr_index(receivers, len(node_ids))
+    neighbors = receivers[out_edges]
+    recv_order = np.lexsort((neighbors, senders[out_edges])).astype(np.int32)
+
+    return CSRGraph(
+        node_ids=node_ids,
+        node_to_idx=node_to_idx,
+        sender_idx=senders,
+        receiver_idx=receivers,
+        amount=amounts,
+        ts_epoch=ts,
+        indptr=indptr,
+        out_edges=out_edges,
+        in_indptr=in_indptr,
+        in_edges=in_edges,
+        neighbors=neighbors,
+        edge_amount=amounts[out_edges],
+        edge_ts=ts[out_edges],
+        recv_order=recv_order,
+        degree=(np.diff(indptr) + np.diff(in_indptr)).astype(np.int32),
+        out_by_time=np.lexsort((ts, senders)).astype(np.int32),
+        in_by_time=np.lexsort((ts, receivers)).astype(np.int32),
+    )
+
+
+def _csr_index(keys: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Group tx indices by key node; stable sort keeps transaction order."""
+    order = np.argsort(keys, kind="stable").astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, order
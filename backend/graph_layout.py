@@ -91,10 +91,15 @@ def compute_layout(
     low_risk: List[str] = []
     high_risk: List[str] = []
 
-    for node_id in sorted(graph.all_nodes):
+    sorted_nodes = graph.sorted_nodes
+    node_tiers: Dict[str, str] = {}
+    score_of: Dict[str, float] = {}
+    for node_id in sorted_nodes:
         sus_info = sus_lookup.get(node_id)
         score = sus_info["suspicion_score"] if sus_info else 0.0
         tier = _risk_tier(score)
+        node_tiers[node_id] = tier
+        score_of[node_id] = score
         if tier == "no_risk":
             no_risk.append(node_id)
         elif tier == "low_risk":
@@ -102,21 +107,11 @@ def compute_layout(
         else:
             high_risk.append(node_id)
 
-    # Sort each bucket by score (ascending within section for consistent ordering)
-    def key_no_risk(nid: str) -> Tuple[float, str]:
-        return (0.0, nid)
-
-    def key_low_risk(nid: str) -> Tuple[float, str]:
-        s = sus_lookup.get(nid, {}).get("suspicion_score", 0)
-        return (s, nid)
-
-    def key_high_risk(nid: str) -> Tuple[float, str]:
-        s = sus_lookup.get(nid, {}).get("suspicion_score", 0)
-        return (-s, nid)  # descending by score in high-risk
-
-    no_risk.sort(key=key_no_risk)
-    low_risk.sort(key=key_low_risk)
-    high_risk.sort(key=key_high_risk)
+    # Sort each bucket by score (ascending within section for consistent ordering).
+    # Buckets are already in id order and sort is stable, so ties stay by id;
+    # no_risk needs no sort at all.
+    low_risk.sort(key=score_of.__getitem__)
+    high_risk.sort(key=lambda nid: -score_of[nid])  # descending by score in high-risk
 
     # Calculate section widths and positions to ensure no overlap
     no_risk_width = _calculate_section_width(len(no_risk))
@@ -140,12 +135,12 @@ def compute_layout(
 
     # Build nodes list with risk_tier
     nodes = []
-    for node_id in sorted(graph.all_nodes):
+    for node_id in sorted_nodes:
         stats = graph.node_stats.get(node_id)
         position = pos_map.get(node_id, (0, 0))
         sus_info = sus_lookup.get(node_id)
-        score = sus_info["suspicion_score"] if sus_info else 0.0
-        tier = _risk_tier(score)
+        score = score_of[node_id]
+        tier = node_tiers[node_id]
 
         node_data = {
             "id": node_id,
@@ -161,19 +156,18 @@ def compute_layout(
         }
         nodes.append(node_data)
 
-    # Build deduplicated edges
-    seen_edges = set()
-    edges = []
-    for tx in graph.transactions:
-        if tx.transaction_id in seen_edges:
-            continue
-        seen_edges.add(tx.transaction_id)
-        edges.append({
+    # Transaction ids are unique after parsing, so edges need no dedup.
+    # Timestamps go out as epoch milliseconds; the frontend formats them.
+    edges = [
+        {
             "source": tx.sender,
             "target": tx.receiver,
             "amount": tx.amount,
             "transaction_id": tx.transaction_id,
-        })
+            "timestamp_ms": tx.timestamp_ms,
+        }
+        for tx in graph.transactions
+    ]
 
     return {
         "nodes": nodes,
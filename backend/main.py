@@ -13,38 +13,110 @@ Serves the frontend from ../frontend/
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Optional, Dict, List
+from typing import Any, BinaryIO, Optional, Dict, Iterator, List
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import BackgroundTasks, FastAPI, UploadFile, File, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
-from backend.graph_builder import parse_csv, GraphData
-from backend.cycle_detector import detect_cycles
+from backend.graph_builder import parse_csv_stream, graph_from_transactions, GraphData, Transaction
+from backend.cycle_detector import detect_cycles, shutdown_executor as shutdown_cycle_pool
 from backend.smurf_detector import detect_smurfing
-from backend.shell_detector import detect_shell_chains
+from backend.shell_detector import detect_shell_chains, shutdown_executor as shutdown_shell_pool
 from backend.scoring_engine import run_scoring_pipeline
 from backend.graph_layout import compute_layout
-# Try importing Neo4j modules; strictly likely present from remote
+from backend.neo4j_graph import neo4j_configured, sync_to_neo4j, fetch_graph_from_neo4j
+from backend.result_store import result_store_from_env
+
 try:
-    from backend.neo4j_graph import sync_to_neo4j, fetch_graph_from_neo4j
+    import orjson
 except ImportError:
-    # Fallback if file missing (though git merge should provide it)
-    def sync_to_neo4j(*args, **kwargs): return False
-    def fetch_graph_from_neo4j(): return None
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_bytes(content: Any) -> bytes:
+    """Compact JSON encoding: orjson when installed, else Starlette's settings."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (several times faster on graph_data) when installed."""
+
+    def render(self, content: Any) -> bytes:
+        return _json_bytes(content)
+
+
+def _stream_json(obj: dict) -> Iterator[bytes]:
+    """Encode a dict piecewise: nested dicts recurse, long lists go out in batches."""
+    sep = b"{"
+    for key, value in obj.items():
+        yield sep + _json_bytes(key) + b":"
+        sep = b","
+        if isinstance(value, dict) and value:
+            yield from _stream_json(value)
+        elif isinstance(value, list) and len(value) > STREAM_BATCH_SIZE:
+            for start in range(0, len(value), STREAM_BATCH_SIZE):
+                batch = _json_bytes(value[start:start + STREAM_BATCH_SIZE])
+                yield (b"[" if start == 0 else b",") + batch[1:-1]
+            yield b"]"
+        else:
+            yield _json_bytes(value)
+    yield b"}" if sep == b"," else b"{}"
+
+
+def _analysis_response(response: dict) -> Response:
+    """Stream large analysis payloads instead of encoding them in one piece."""
+    if len(response["graph_data"]["edges"]) > STREAM_EDGE_THRESHOLD:
+        return StreamingResponse(_stream_json(response), media_type="application/json")
+    return FastJSONResponse(content=response)
 
-app = FastAPI(title="Anti-Mul Fraud Detection API", version="1.0.0")
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield
+    # Stop the RIFT_PARALLEL search workers with the server
+    shutdown_cycle_pool()
+    shutdown_shell_pool()
+
+
+app = FastAPI(
+    title="Anti-Mul Fraud Detection API",
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=_lifespan,
+)
 
 # ── CORS ──────────────────────────────────────────────────────────
+# Comma-separated allowed origins; pin to the frontend origin in production
+CORS_ORIGINS = [o.strip() for o in os.environ.get("CORS_ORIGINS", "*").split(",") if o.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
 )
 
 # ── Static files ──────────────────────────────────────────────────
@@ -54,9 +126,209 @@ _FRONTEND_DIR = _PROJECT_ROOT / "frontend"
 if _FRONTEND_DIR.exists():
     app.mount("/static", StaticFiles(directory=str(_FRONTEND_DIR)), name="static")
 
+# index.html is read once at startup and served from memory
+_INDEX_FILE = _FRONTEND_DIR / "index.html"
+_INDEX_BYTES: Optional[bytes] = _INDEX_FILE.read_bytes() if _INDEX_FILE.exists() else None
+_INDEX_ETAG = (
+    f'"{hashlib.blake2b(_INDEX_BYTES, digest_size=8).hexdigest()}"' if _INDEX_BYTES is not None else None
+)
+
+# Transactions returned per direction by /account/{id} unless ?limit= is given
+ACCOUNT_TX_LIMIT = 50
+
+# Human-readable reasons for detected_patterns entries (cycle_length_N is templated)
+_PATTERN_REASONS = {
+    "cycle": "Involved in circular transaction routing",
+    "smurfing": "Fan-out pattern: distributing funds to many accounts",
+    "shell": "Shell chain: layered pass-through transactions",
+}
+_CYCLE_LENGTH_PREFIX = "cycle_length_"
+
+# /analyze responses with more edges than this are streamed in batches
+STREAM_EDGE_THRESHOLD = 10_000
+STREAM_BATCH_SIZE = 2_000
+
+# Content-type substrings accepted for uploads without a .csv extension
+_CSV_CONTENT_TYPE_HINTS = ("csv", "text", "excel", "octet-stream")
+
 # ── Module-level store for the latest analysis result ─────────────
 _last_result: dict | None = None
 _last_graph = None
+# Per-account lookups into _last_result, built when it is published
+_sus_by_id: Dict[str, dict] = {}
+_rings_by_id: Dict[str, List[dict]] = {}
+# ETag of _last_result (a hash of its rendered download) and that download
+_last_etag: Optional[str] = None
+_last_download: bytes = b""
+# Shares the above across workers/restarts when REDIS_URL or RIFT_STATE_DIR is set
+_result_store = result_store_from_env()
+# Reads poll the store's ETag key at most this often, not on every request
+_STORE_POLL_SECONDS = 1.0
+_store_checked_at = float("-inf")
+
+# ── Recent analyses keyed by upload content hash (LRU) ────────────
+ANALYSIS_CACHE_SIZE = 8
+_HASH_CHUNK = 1 << 20
+_analysis_cache: OrderedDict[bytes, tuple] = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+# Threads for running detectors alongside each other; the Numba cycle kernel
+# releases the GIL, the pure-Python parts interleave
+_detector_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="detector")
+
+
+def _content_key(fileobj) -> bytes:
+    """blake2b digest of an upload's bytes; leaves the stream rewound."""
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: fileobj.read(_HASH_CHUNK), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.digest()
+
+
+def _publish(state: tuple) -> None:
+    """Make `state` the latest analysis here and in the shared store, if any."""
+    global _last_graph, _last_result, _sus_by_id, _rings_by_id, _last_etag, _last_download
+    global _store_checked_at
+    (_last_graph, _last_result, _sus_by_id, _rings_by_id,
+     _last_etag, _last_download) = state
+    if _result_store is not None:
+        _store_checked_at = time.monotonic()
+        try:
+            _result_store.save(_last_etag, _state_bytes(_last_graph, _last_result, _last_etag))
+        except Exception as e:
+            logger.warning("Result store save failed: %s", e)
+
+
+def _refresh_from_store() -> None:
+    """Adopt an analysis published by another worker (or before a restart)."""
+    global _last_graph, _last_result, _sus_by_id, _rings_by_id, _last_etag, _last_download
+    global _store_checked_at
+    if _result_store is None:
+        return
+    now = time.monotonic()
+    if now - _store_checked_at < _STORE_POLL_SECONDS:
+        return
+    _store_checked_at = now
+    try:
+        blob = _result_store.load_if_changed(_last_etag)
+        if blob is None:
+            return
+        state = _state_from_bytes(blob)
+    except Exception as e:
+        logger.warning("Result store load failed: %s", e)
+        return
+    (_last_graph, _last_result, _sus_by_id, _rings_by_id,
+     _last_etag, _last_download) = state
+
+
+def _state_bytes(graph: GraphData, response: dict, etag: str) -> bytes:
+    """JSON document for the result store: the response plus the rows to rebuild the graph."""
+    return _json_bytes({
+        "etag": etag,
+        "response": response,
+        "transactions": [
+            [tx.transaction_id, tx.sender, tx.receiver, tx.amount, tx.ts_epoch]
+            for tx in graph.transactions
+        ],
+    })
+
+
+def _state_from_bytes(blob: bytes) -> tuple:
+    """Inverse of _state_bytes: the published-state tuple, graph rebuilt from the rows."""
+    doc = orjson.loads(blob) if orjson is not None else json.loads(blob)
+    response = doc["response"]
+    graph = graph_from_transactions([
+        Transaction(
+            transaction_id=tx_id,
+            sender=sys.intern(sender),
+            receiver=sys.intern(receiver),
+            amount=amount,
+            timestamp=datetime.fromtimestamp(sec, timezone.utc),
+        )
+        for tx_id, sender, receiver, amount, sec in doc["transactions"]
+    ])
+    return (
+        graph, response, *_index_result(response),
+        doc["etag"], _download_bytes(response),
+    )
+
+
+def _sync_to_neo4j_background(graph: GraphData, suspicious_accounts: List[dict], fraud_rings: List[dict]) -> None:
+    """Background task wrapper: a failed sync is logged, never raised."""
+    try:
+        if not sync_to_neo4j(graph, suspicious_accounts, fraud_rings):
+            logger.debug("Neo4j sync did not complete")
+    except Exception as e:
+        logger.debug("Neo4j sync skipped: %s", e)
+
+
+def _queue_neo4j_sync(
+    background_tasks: BackgroundTasks,
+    graph: GraphData,
+    suspicious_accounts: List[dict],
+    fraud_rings: List[dict],
+) -> str:
+    """
+    Schedule a Neo4j sync after the response; returns `neo4j_sync_status`,
+    "pending" when queued or "disabled" without NEO4J_URI. `neo4j_synced`
+    stays a bool and is false either way: nothing is synced before the
+    response goes out.
+    """
+    if not neo4j_configured():
+        return "disabled"
+    background_tasks.add_task(_sync_to_neo4j_background, graph, suspicious_accounts, fraud_rings)
+    return "pending"
+
+
+def _latest(txs: List[Any], limit: int, key) -> List[Any]:
+    """The `limit` latest transactions, in ascending time order."""
+    ordered = sorted(txs, key=key)
+    return ordered[len(ordered) - limit:] if limit < len(ordered) else ordered
+
+
+def _download_bytes(response: dict) -> bytes:
+    """Render the /download-json payload for an analysis response."""
+    download_payload = {
+        "suspicious_accounts": response["suspicious_accounts"],
+        "fraud_rings": response["fraud_rings"],
+        "summary": {
+            **response["summary"],
+            "processing_time_seconds": response["processing_time_seconds"],
+        },
+    }
+    return FastJSONResponse(content=download_payload).body
+
+
+def _download_etag(download: bytes) -> str:
+    """Strong ETag for a rendered download; changes whenever its bytes do."""
+    return f'"{hashlib.blake2b(download, digest_size=16).hexdigest()}"'
+
+
+def _index_result(response: dict) -> tuple:
+    """Build account_id -> suspicious entry / member rings lookups."""
+    sus_by_id = {sa["account_id"]: sa for sa in response["suspicious_accounts"]}
+    rings_by_id: Dict[str, List[dict]] = {}
+    for ring in response["fraud_rings"]:
+        for account_id in set(ring["member_accounts"]):
+            rings_by_id.setdefault(account_id, []).append(ring)
+    return sus_by_id, rings_by_id
+
+
+@lru_cache(maxsize=64)
+def _pattern_reason(pattern: str) -> Optional[str]:
+    """Human-readable reason for a detected pattern label, if it has one."""
+    reason = _PATTERN_REASONS.get(pattern)
+    if reason is None and pattern.startswith(_CYCLE_LENGTH_PREFIX):
+        length = pattern[len(_CYCLE_LENGTH_PREFIX):]
+        if length.isdigit():
+            reason = f"Part of a {length}-node circular money loop"
+    return reason
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header lists `etag`."""
+    return bool(if_none_match) and etag in (tag.strip() for tag in if_none_match.split(","))
 
 
 # ── Health ────────────────────────────────────────────────────────
@@ -66,30 +338,25 @@ def health():
 
 
 @app.get("/")
-def root():
+def root(if_none_match: Optional[str] = Header(None)):
     """Serve the frontend index.html."""
-    index_file = _FRONTEND_DIR / "index.html"
-    if index_file.exists():
-        return FileResponse(str(index_file), media_type="text/html")
-    return {"status": "ok", "service": "Money Muling Detection Engine"}
+    if _INDEX_BYTES is None:
+        return {"status": "ok", "service": "Money Muling Detection Engine"}
+    headers = {"ETag": _INDEX_ETAG, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, _INDEX_ETAG):
+        return Response(status_code=304, headers=headers)
+    return Response(content=_INDEX_BYTES, media_type="text/html", headers=headers)
 
 
 # ── Analyze ───────────────────────────────────────────────────────
 @app.post("/analyze")
-def analyze(file: UploadFile = File(...)):
+async def analyze(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """Upload a CSV file and run the full fraud detection pipeline."""
-    global _last_result, _last_graph
-
-    # ── Validate file type (checking extension and content type) ──
-    filename = (file.filename or "").lower()
-    ct = (file.content_type or "").lower()
-    is_csv = (
-        filename.endswith(".csv")
-        or "csv" in ct
-        or "text" in ct
-        or "excel" in ct
-        or "octet-stream" in ct
-    )
+    # ── Validate file type (checking extension, then content type) ──
+    is_csv = (file.filename or "").lower().endswith(".csv")
+    if not is_csv:
+        ct = (file.content_type or "").lower()
+        is_csv = any(hint in ct for hint in _CSV_CONTENT_TYPE_HINTS)
     if not is_csv:
         raise HTTPException(
             status_code=400,
@@ -97,89 +364,109 @@ def analyze(file: UploadFile = File(...)):
         )
 
     try:
-        # Read and decode
-        raw_bytes = file.file.read()
-        try:
-            raw = raw_bytes.decode("utf-8-sig")
-        except UnicodeDecodeError:
-            try:
-                raw = raw_bytes.decode("utf-8")
-            except UnicodeDecodeError:
-                try:
-                    raw = raw_bytes.decode("latin-1")
-                except Exception:
-                    raise HTTPException(status_code=400, detail="File must be UTF-8 encoded.")
-
-        start = time.time()
-
-        try:
-            graph = parse_csv(raw)
-        except ValueError as exc:
-            raise HTTPException(status_code=422, detail=str(exc))
-
-        _last_graph = graph
-
-        # Pattern detection
-        cycle_rings = detect_cycles(graph)
-        smurf_rings = detect_smurfing(graph)
-        shell_rings = detect_shell_chains(graph)
+        # Hashing, parsing and the CPU-bound stages run in a worker thread
+        # so the event loop keeps accepting uploads
+        return await asyncio.to_thread(_run_analysis, file.file, background_tasks)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("analyze failed")
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
-        # Scoring
-        result = run_scoring_pipeline(graph, cycle_rings, smurf_rings, shell_rings)
 
-        # Layout
-        layout = compute_layout(
-            graph,
-            result["suspicious_accounts"],
-            result.get("_all_rings", []),
+def _run_analysis(fileobj: BinaryIO, background_tasks: BackgroundTasks) -> Response:
+    """Run (or reuse) the full pipeline for an uploaded CSV and publish it."""
+    # Re-uploads of the same file reuse the earlier analysis
+    key = _content_key(fileobj)
+    start = time.time()
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+    if cached is not None:
+        graph, stored, sus_by_id, rings_by_id, _, _ = cached
+        # Neo4j may hold a later upload's graph: sync this one again
+        neo4j_sync_status = _queue_neo4j_sync(
+            background_tasks, graph, stored["suspicious_accounts"], stored["fraud_rings"],
         )
-
-        # Attach timestamps to edges for frontend if needed
-        tx_timestamp_map = {tx.transaction_id: tx.timestamp.isoformat() for tx in graph.transactions}
-        for edge in layout["edges"]:
-            edge["timestamp"] = tx_timestamp_map.get(edge["transaction_id"], "")
-
-        # Clean up internal data
-        result.pop("_all_rings", None)
-
-        # Neo4j Sync
-        neo4j_synced = False
-        try:
-            neo4j_synced = sync_to_neo4j(
-                graph,
-                result["suspicious_accounts"],
-                result["fraud_rings"],
-            )
-        except Exception as e:
-            print(f"DEBUG: Neo4j sync skipped: {e}")
-
         processing_time_seconds = round(time.time() - start, 4)
-        result["summary"]["processing_time_seconds"] = processing_time_seconds
-
         response = {
-            "graph_data": layout,
-            "suspicious_accounts": result["suspicious_accounts"],
-            "fraud_rings": result["fraud_rings"],
-            "summary": result["summary"],
+            **stored,
+            "summary": {**stored["summary"], "processing_time_seconds": processing_time_seconds},
             "processing_time_seconds": processing_time_seconds,
-            "neo4j_synced": neo4j_synced,
+            "neo4j_synced": False,
+            "neo4j_sync_status": neo4j_sync_status,
         }
+        download = _download_bytes(response)
+        _publish((graph, response, sus_by_id, rings_by_id, _download_etag(download), download))
+        return _analysis_response(response)
 
-        _last_result = response
+    # Decode and parse straight off the spooled upload
+    try:
+        graph = parse_csv_stream(fileobj)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    # Pattern detection: the detectors only read the graph, so cycles and
+    # smurfing run on the detector pool while this thread walks shell chains
+    cycle_future = _detector_pool.submit(detect_cycles, graph)
+    smurf_future = _detector_pool.submit(detect_smurfing, graph)
+    shell_rings = detect_shell_chains(graph)
+    cycle_rings = cycle_future.result()
+    smurf_rings = smurf_future.result()
+
+    # Scoring
+    result = run_scoring_pipeline(graph, cycle_rings, smurf_rings, shell_rings)
+
+    # Layout
+    layout = compute_layout(
+        graph,
+        result["suspicious_accounts"],
+        result.get("_all_rings", []),
+    )
 
-        return JSONResponse(content=response)
-    except HTTPException:
-        raise
-    except Exception as e:
-        import traceback
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    # Clean up internal data
+    result.pop("_all_rings", None)
+
+    # Neo4j Sync runs after the response is sent
+    neo4j_sync_status = _queue_neo4j_sync(
+        background_tasks, graph, result["suspicious_accounts"], result["fraud_rings"],
+    )
+
+    processing_time_seconds = round(time.time() - start, 4)
+    result["summary"]["processing_time_seconds"] = processing_time_seconds
+
+    response = {
+        "graph_data": layout,
+        "suspicious_accounts": result["suspicious_accounts"],
+        "fraud_rings": result["fraud_rings"],
+        "summary": result["summary"],
+        "processing_time_seconds": processing_time_seconds,
+        "neo4j_synced": False,
+        "neo4j_sync_status": neo4j_sync_status,
+    }
+
+    # Publish graph, result and indexes together: this runs in a worker
+    # thread, so concurrent uploads must not interleave them
+    download = _download_bytes(response)
+    published = (
+        graph, response, *_index_result(response),
+        _download_etag(download), download,
+    )
+    _publish(published)
+    with _analysis_cache_lock:
+        _analysis_cache[key] = published
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+    return _analysis_response(response)
 
 
 # ── Account Deep-Dive ─────────────────────────────────────────────
 @app.get("/account/{account_id}")
-def account_detail(account_id: str):
-    """Return deep-dive data for a specific account."""
+def account_detail(account_id: str, limit: int = Query(ACCOUNT_TX_LIMIT, ge=0)):
+    """Return deep-dive data for a specific account (latest `limit` transactions each way)."""
+    _refresh_from_store()
     if _last_result is None or _last_graph is None:
         raise HTTPException(status_code=404, detail="No analysis has been run yet.")
 
@@ -189,57 +476,44 @@ def account_detail(account_id: str):
 
     stats = graph.node_stats.get(account_id)
 
+    by_time = attrgetter("timestamp")
     outgoing = []
-    for tx in graph.adj_list.get(account_id, []):
+    for tx in _latest(graph.adj_list.get(account_id, ()), limit, by_time):
         outgoing.append({
             "transaction_id": tx.transaction_id,
             "to": tx.receiver,
             "amount": tx.amount,
-            "timestamp": tx.timestamp.isoformat(),
+            "timestamp_ms": tx.timestamp_ms,
         })
 
     incoming = []
-    for tx in graph.reverse_adj_list.get(account_id, []):
+    for tx in _latest(graph.reverse_adj_list.get(account_id, ()), limit, by_time):
         incoming.append({
             "transaction_id": tx.transaction_id,
             "from": tx.sender,
             "amount": tx.amount,
-            "timestamp": tx.timestamp.isoformat(),
+            "timestamp_ms": tx.timestamp_ms,
         })
 
-    sus_info = None
-    for sa in _last_result.get("suspicious_accounts", []):
-        if sa["account_id"] == account_id:
-            sus_info = sa
-            break
-
-    member_rings = []
-    for ring in _last_result.get("fraud_rings", []):
-        if account_id in ring["member_accounts"]:
-            member_rings.append(ring)
+    sus_info = _sus_by_id.get(account_id)
+    member_rings = _rings_by_id.get(account_id, [])
 
     reasons = []
     if sus_info:
         patterns = sus_info.get("detected_patterns", [])
         for p in patterns:
-            if p.startswith("cycle_length_"):
-                length = p.split("_")[-1]
-                reasons.append(f"Part of a {length}-node circular money loop")
-            elif p == "cycle":
-                reasons.append("Involved in circular transaction routing")
-            elif p == "smurfing":
-                reasons.append("Fan-out pattern: distributing funds to many accounts")
-            elif p == "shell":
-                reasons.append("Shell chain: layered pass-through transactions")
+            reason = _pattern_reason(p)
+            if reason:
+                reasons.append(reason)
 
         if len(member_rings) > 1:
             reasons.append(f"Member of {len(member_rings)} fraud rings simultaneously")
 
-        total_tx = len(outgoing) + len(incoming)
+        total_tx = stats.total_degree if stats else 0
         if total_tx > 5:
             reasons.append(f"High transaction velocity: {total_tx} transactions detected")
 
-    return JSONResponse(content={
+    return FastJSONResponse(content={
         "account_id": account_id,
         "suspicion_score": sus_info["suspicion_score"] if sus_info else 0,
         "is_suspicious": sus_info is not None,
@@ -252,8 +526,8 @@ def account_detail(account_id: str):
             "total_in_amount": round(stats.total_in_amount, 2) if stats else 0,
             "total_out_amount": round(stats.total_out_amount, 2) if stats else 0,
         },
-        "outgoing_transactions": sorted(outgoing, key=lambda x: x["timestamp"]),
-        "incoming_transactions": sorted(incoming, key=lambda x: x["timestamp"]),
+        "outgoing_transactions": outgoing,
+        "incoming_transactions": incoming,
     })
 
 
@@ -267,31 +541,31 @@ def neo4j_graph():
             status_code=503,
             detail="Neo4j not configured (set NEO4J_URI) or no graph data available.",
         )
-    return JSONResponse(content=data)
+    return FastJSONResponse(content=data)
 
 
 # ── Download JSON ──────────────────────────────────────────────────
 @app.get("/download-json")
-def download_json():
+def download_json(if_none_match: Optional[str] = Header(None)):
     """Return the latest analysis result as JSON."""
-    if _last_result is None:
+    _refresh_from_store()
+    result, etag, body = _last_result, _last_etag, _last_download
+    if result is None:
         raise HTTPException(status_code=404, detail="No analysis has been run yet.")
 
-    download_payload = {
-        "suspicious_accounts": _last_result["suspicious_accounts"],
-        "fraud_rings": _last_result["fraud_rings"],
-        "summary": {
-            **_last_result["summary"],
-            "processing_time_seconds": _last_result["processing_time_seconds"],
-        },
-    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    return JSONResponse(
-        content=download_payload,
-        headers={"Content-Disposition": 'attachment; filename="analysis_result.json"'},
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "Content-Disposition": 'attachment; filename="analysis_result.json"',
+            "ETag": etag,
+        },
     )
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="debug")
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
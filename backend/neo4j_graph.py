@@ -11,11 +11,15 @@ Set NEO4J_URI (e.g. neo4j://localhost:7687) to enable. If unset, sync is skipped
 
 from __future__ import annotations
 
+import logging
 import os
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from backend.graph_builder import GraphData, Transaction
 
+logger = logging.getLogger(__name__)
+
 
 # ── Account type labels (Neo4j labels) ─────────────────────────────
 # Derived from detected_patterns for clean graph representation
@@ -27,13 +31,23 @@ LABEL_SHELL = "ShellNode"
 LABEL_MULTI = "MultiPattern"  # Has 2+ fraud pattern types
 LABEL_SUSPICIOUS = "Suspicious"
 
+# Rows per UNWIND statement when writing to Neo4j
+NEO4J_BATCH_SIZE = 10_000
+
+
+@lru_cache(maxsize=256)
+def _get_account_labels(patterns: Tuple[str, ...], has_score: bool) -> str:
+    """
+    Map detection patterns to the Neo4j label string for a typed Account.
 
-def _get_account_labels(patterns: List[str], suspicion_score: float) -> List[str]:
-    """Map detection patterns to Neo4j labels for typed account representation."""
+    Memoized: takes the patterns as a (sorted) tuple and whether the
+    suspicion score is positive, since only a handful of distinct
+    combinations occur across all nodes.
+    """
     labels = [LABEL_ACCOUNT]
-    if not patterns or suspicion_score <= 0:
+    if not patterns or not has_score:
         labels.append(LABEL_LEGITIMATE)
-        return labels
+        return ":".join(labels)
 
     labels.append(LABEL_SUSPICIOUS)
     has_cycle = any(p == "cycle" or p.startswith("cycle_length_") for p in patterns)
@@ -49,13 +63,24 @@ def _get_account_labels(patterns: List[str], suspicion_score: float) -> List[str
     if sum([has_cycle, has_smurf, has_shell]) >= 2:
         labels.append(LABEL_MULTI)
 
-    return labels
+    return ":".join(labels)
+
+
+def _batches(rows: List[dict], size: int = NEO4J_BATCH_SIZE) -> Iterator[List[dict]]:
+    """Split UNWIND parameter rows into chunks of at most `size`."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
 
 
 def _build_suspicion_lookup(suspicious_accounts: List[dict]) -> Dict[str, dict]:
     return {sa["account_id"]: sa for sa in suspicious_accounts}
 
 
+def neo4j_configured() -> bool:
+    """True when NEO4J_URI is set, i.e. sync/fetch will try to connect."""
+    return bool(os.environ.get("NEO4J_URI", "").strip())
+
+
 def sync_to_neo4j(
     graph: GraphData,
     suspicious_accounts: List[dict],
@@ -81,6 +106,51 @@ def sync_to_neo4j(
 
     sus_lookup = _build_suspicion_lookup(suspicious_accounts)
 
+    # ── Parameter rows for batched UNWIND writes ──
+    # Only scored accounts get explicit rows; every other account is created
+    # as Legitimate by the SENT_TO writes below (each node has an edge).
+    node_groups: Dict[str, List[dict]] = {}
+    for node_id, sus_info in sus_lookup.items():
+        if node_id not in graph.all_nodes:
+            continue
+        stats = graph.node_stats.get(node_id)
+        patterns = sus_info.get("detected_patterns", [])
+        score = float(sus_info.get("suspicion_score", 0))
+        label_str = _get_account_labels(tuple(sorted(patterns)), not score <= 0)
+
+        node_groups.setdefault(label_str, []).append({
+            "id": node_id,
+            "score": score,
+            "in_deg": stats.in_degree if stats else 0,
+            "out_deg": stats.out_degree if stats else 0,
+            "patterns": patterns,
+        })
+
+    edge_rows = [
+        {
+            "sender": tx_obj.sender,
+            "receiver": tx_obj.receiver,
+            "tx_id": tx_obj.transaction_id,
+            "amount": float(tx_obj.amount),
+            "timestamp": tx_obj.timestamp_iso,
+        }
+        for tx_obj in graph.transactions
+    ]
+
+    ring_rows: List[dict] = []
+    member_rows: List[dict] = []
+    for ring in fraud_rings:
+        ring_id = ring.get("ring_id", "")
+        ring_rows.append({
+            "ring_id": ring_id,
+            "pattern_type": ring.get("pattern_type", "unknown"),
+            "risk": float(ring.get("risk_score", 0)),
+        })
+        member_rows.extend(
+            {"member": member_id, "ring_id": ring_id}
+            for member_id in ring.get("member_accounts", [])
+        )
+
     def _run_tx(tx):
         # Clear previous analysis for this session
         tx.run("MATCH (a:Account) DETACH DELETE a")
@@ -92,79 +162,68 @@ def sync_to_neo4j(
         except Exception:
             pass
 
-        # Create Account nodes with type labels
-        for node_id in graph.all_nodes:
-            stats = graph.node_stats.get(node_id)
-            sus_info = sus_lookup.get(node_id)
-
-            if sus_info:
-                patterns = sus_info.get("detected_patterns", [])
-                score = float(sus_info.get("suspicion_score", 0))
-                labels = _get_account_labels(patterns, score)
-            else:
-                patterns = []
-                score = 0.0
-                labels = [LABEL_ACCOUNT, LABEL_LEGITIMATE]
-
-            in_deg = stats.in_degree if stats else 0
-            out_deg = stats.out_degree if stats else 0
+        # Create Account nodes with type labels: one UNWIND per label set,
+        # since labels cannot be parameterised
+        for label_str, rows in node_groups.items():
+            for batch in _batches(rows):
+                tx.run(
+                    f"""
+                    UNWIND $rows AS r
+                    MERGE (a:{label_str} {{id: r.id}})
+                    SET a.suspicion_score = r.score,
+                        a.in_degree = r.in_deg,
+                        a.out_degree = r.out_deg,
+                        a.patterns = r.patterns
+                    """,
+                    rows=batch,
+                )
 
-            label_str = ":".join(labels)
+        # Create SENT_TO relationships, creating unscored endpoints as
+        # Legitimate accounts on first sight
+        for batch in _batches(edge_rows):
             tx.run(
                 f"""
-                MERGE (a:{label_str} {{id: $id}})
-                SET a.suspicion_score = $score,
-                    a.in_degree = $in_deg,
-                    a.out_degree = $out_deg,
-                    a.patterns = $patterns
+                UNWIND $rows AS r
+                MERGE (a:{LABEL_ACCOUNT} {{id: r.sender}})
+                  ON CREATE SET a:{LABEL_LEGITIMATE}, a.suspicion_score = 0.0, a.patterns = []
+                MERGE (b:{LABEL_ACCOUNT} {{id: r.receiver}})
+                  ON CREATE SET b:{LABEL_LEGITIMATE}, b.suspicion_score = 0.0, b.patterns = []
+                MERGE (a)-[e:SENT_TO {{transaction_id: r.tx_id}}]->(b)
+                SET e.amount = r.amount, e.timestamp = r.timestamp
                 """,
-                id=node_id,
-                score=score,
-                in_deg=in_deg,
-                out_deg=out_deg,
-                patterns=patterns,
+                rows=batch,
             )
 
-        # Create SENT_TO relationships
-        for tx_obj in graph.transactions:
+        # Degrees of the implicitly created accounts, counted server-side
+        # (transaction ids are unique, so one SENT_TO per transaction)
+        tx.run(
+            """
+            MATCH (a:Account) WHERE a.in_degree IS NULL
+            SET a.in_degree = COUNT { (a)<-[:SENT_TO]-() },
+                a.out_degree = COUNT { (a)-[:SENT_TO]->() }
+            """
+        )
+
+        # Optional: FraudRing nodes and RING_MEMBER relationships
+        for batch in _batches(ring_rows):
             tx.run(
                 """
-                MATCH (a:Account {id: $sender})
-                MATCH (b:Account {id: $receiver})
-                MERGE (a)-[r:SENT_TO {transaction_id: $tx_id}]->(b)
-                SET r.amount = $amount, r.timestamp = $timestamp
+                UNWIND $rows AS r
+                MERGE (f:FraudRing {id: r.ring_id})
+                SET f.pattern_type = r.pattern_type, f.risk_score = r.risk
                 """,
-                sender=tx_obj.sender,
-                receiver=tx_obj.receiver,
-                tx_id=tx_obj.transaction_id,
-                amount=float(tx_obj.amount),
-                timestamp=tx_obj.timestamp.isoformat(),
+                rows=batch,
             )
-
-        # Optional: FraudRing nodes and RING_MEMBER relationships
-        for ring in fraud_rings:
-            ring_id = ring.get("ring_id", "")
-            pattern_type = ring.get("pattern_type", "unknown")
-            risk = float(ring.get("risk_score", 0))
+        for batch in _batches(member_rows):
             tx.run(
                 """
-                MERGE (r:FraudRing {id: $ring_id})
-                SET r.pattern_type = $pattern_type, r.risk_score = $risk
+                UNWIND $rows AS r
+                MATCH (a:Account {id: r.member})
+                MATCH (f:FraudRing {id: r.ring_id})
+                MERGE (a)-[:RING_MEMBER]->(f)
                 """,
-                ring_id=ring_id,
-                pattern_type=pattern_type,
-                risk=risk,
+                rows=batch,
             )
-            for member_id in ring.get("member_accounts", []):
-                tx.run(
-                    """
-                    MATCH (a:Account {id: $member})
-                    MATCH (r:FraudRing {id: $ring_id})
-                    MERGE (a)-[:RING_MEMBER]->(r)
-                    """,
-                    member=member_id,
-                    ring_id=ring_id,
-                )
 
     try:
         driver = GraphDatabase.driver(uri, auth=(user, password))
@@ -173,7 +232,7 @@ def sync_to_neo4j(
         driver.close()
         return True
     except Exception as e:
-        print(f"DEBUG: Neo4j sync failed: {e}")
+        logger.debug("Neo4j sync failed: %s", e)
         return False
 
 
@@ -243,5 +302,5 @@ def fetch_graph_from_neo4j() -> Optional[dict]:
         driver.close()
         return data if data and (data["nodes"] or data["edges"]) else None
     except Exception as e:
-        print(f"DEBUG: Neo4j fetch failed: {e}")
+        logger.debug("Neo4j fetch failed: %s", e)
         return None
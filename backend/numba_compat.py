@@ -0,0 +1,21 @@
+"""
+numba_compat.py — Optional Numba JIT support
+
+Numba is an optional accelerator. When it is installed, `njit` is the real
+decorator and HAS_NUMBA is True; otherwise `njit` is a no-op so kernels stay
+importable and callers fall back to their pure-Python paths.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
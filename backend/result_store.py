@@ -0,0 +1,101 @@
+"""
+result_store.py — Shared store for the latest published analysis
+
+The API keeps the latest analysis (graph, response, lookups, download bytes)
+in module globals. Under several workers, or across restarts, those globals
+diverge; this store shares the published state between processes:
+
+  - REDIS_URL set (and the redis package installed): Redis keys
+  - RIFT_STATE_DIR set: JSON files in that directory
+  - neither: no store; each process keeps only its own state
+
+The state is an opaque JSON document built by the API (plain dicts and
+lists, never pickles), so a writable store cannot inject code into the
+server. Readers check the small ETag key first and only load the state when
+it differs from what they already hold.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_REDIS_ETAG_KEY = "rift:last:etag"
+_REDIS_STATE_KEY = "rift:last:state"
+_ETAG_FILE = "last_etag"
+_STATE_FILE = "last_state.json"
+
+
+class ResultStore:
+    """Base class: save the published state bytes, load them when they changed."""
+
+    def save(self, etag: str, state: bytes) -> None:
+        raise NotImplementedError
+
+    def load_if_changed(self, etag: Optional[str]) -> Optional[bytes]:
+        """The stored state if its ETag differs from `etag`, else None."""
+        raise NotImplementedError
+
+
+class RedisResultStore(ResultStore):
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def save(self, etag: str, state: bytes) -> None:
+        with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(_REDIS_STATE_KEY, state)
+            pipe.set(_REDIS_ETAG_KEY, etag)
+            pipe.execute()
+
+    def load_if_changed(self, etag: Optional[str]) -> Optional[bytes]:
+        stored = self._redis.get(_REDIS_ETAG_KEY)
+        if stored is None or stored.decode() == etag:
+            return None
+        return self._redis.get(_REDIS_STATE_KEY)
+
+
+class DiskResultStore(ResultStore):
+    def __init__(self, directory: str):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+    def _replace(self, name: str, data: bytes) -> None:
+        """Write via a temp file + rename so readers never see partial data."""
+        fd, tmp = tempfile.mkstemp(dir=self._dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._dir / name)
+
+    def save(self, etag: str, state: bytes) -> None:
+        # State first: a reader seeing the new ETag must find the new state
+        self._replace(_STATE_FILE, state)
+        self._replace(_ETAG_FILE, etag.encode())
+
+    def load_if_changed(self, etag: Optional[str]) -> Optional[bytes]:
+        try:
+            if (self._dir / _ETAG_FILE).read_bytes().decode() == etag:
+                return None
+            return (self._dir / _STATE_FILE).read_bytes()
+        except FileNotFoundError:
+            return None
+
+
+def result_store_from_env() -> Optional[ResultStore]:
+    """Build the store configured by REDIS_URL / RIFT_STATE_DIR, if any."""
+    url = os.environ.get("REDIS_URL", "").strip()
+    if url:
+        try:
+            return RedisResultStore(url)
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed")
+    directory = os.environ.get("RIFT_STATE_DIR", "").strip()
+    if directory:
+        return DiskResultStore(directory)
+    return None
@@ -17,23 +17,32 @@ from __future__ import annotations
 
 import math
 from collections import defaultdict
-from datetime import timedelta
 from typing import Dict, List, Set, Tuple
 
-from backend.graph_builder import GraphData, Transaction
-from backend.confidence_engine import compute_structural_confidence
+import numpy as np
+
+from backend.graph_builder import CSRGraph, GraphData, Transaction
+from backend.confidence_engine import compute_confidences_batch
 from backend.density_guard import compute_density_adjustments
+from backend.numba_compat import njit
 
 # ── Base weights ──────────────────────────────────────────────────
 WEIGHT_CYCLE = 40
 WEIGHT_SMURF = 30
 WEIGHT_SHELL = 25
 WEIGHT_VELOCITY = 10  # >5 tx in 24h
+VELOCITY_MIN_TX = 5
+VELOCITY_WINDOW_SECONDS = 24 * 3600
 
 INTERACTION_BONUS_CYCLE_SMURF = 10
 INTERACTION_BONUS_CYCLE_SHELL = 8
 INTERACTION_BONUS_PER_PATTERN = 10
 
+# Pattern-type bits, set once per ring member during ring ingestion
+FLAG_CYCLE = 1
+FLAG_SMURF = 2
+FLAG_SHELL = 4
+
 
 def run_scoring_pipeline(
     graph: GraphData,
@@ -52,143 +61,100 @@ def run_scoring_pipeline(
         }
     """
     # ── 1. Map accounts → patterns & rings ────────────────────────
-    account_patterns: Dict[str, Set[str]] = defaultdict(set)
-    account_rings: Dict[str, List[str]] = defaultdict(list)
+    # Accounts are handled by interned node index (lexicographic order, so
+    # index order is id order); ids are mapped back only for the output.
+    node_ids = graph.sorted_nodes
+    node_to_idx = graph.csr.node_to_idx if graph.csr is not None else {
+        nid: i for i, nid in enumerate(node_ids)
+    }
+    account_flags = np.zeros(len(node_ids), dtype=np.uint8)  # FLAG_* bits
+    account_cycle_lengths: Dict[int, Set[int]] = defaultdict(set)
+    account_rings: Dict[int, List[str]] = defaultdict(list)
     all_rings: List[dict] = []
     ring_counter = 0
 
     # Process each ring type
-    for ring in cycle_rings:
-        ring_counter += 1
-        ring_id = f"RING_{ring_counter:03d}"
-        ring["ring_id"] = ring_id
-        ring["structural_confidence"] = compute_structural_confidence(ring, graph)
-        all_rings.append(ring)
-        for member in ring["members"]:
-            account_patterns[member].add("cycle")
-            label = f"cycle_length_{ring['cycle_length']}"
-            if label not in account_patterns[member]:
-                account_patterns[member].add(label)
-            account_rings[member].append(ring_id)
-
-    for ring in smurf_rings:
-        ring_counter += 1
-        ring_id = f"RING_{ring_counter:03d}"
-        ring["ring_id"] = ring_id
-        ring["structural_confidence"] = compute_structural_confidence(ring, graph)
-        all_rings.append(ring)
-        for member in ring["members"]:
-            account_patterns[member].add("smurfing")
-            account_rings[member].append(ring_id)
-
-    for ring in shell_rings:
-        ring_counter += 1
-        ring_id = f"RING_{ring_counter:03d}"
-        ring["ring_id"] = ring_id
-        ring["structural_confidence"] = compute_structural_confidence(ring, graph)
-        all_rings.append(ring)
-        for member in ring["members"]:
-            account_patterns[member].add("shell")
-            account_rings[member].append(ring_id)
-
-    suspicious_set = set(account_patterns.keys())
-    if not suspicious_set:
+    for rings, flag in ((cycle_rings, FLAG_CYCLE), (smurf_rings, FLAG_SMURF), (shell_rings, FLAG_SHELL)):
+        for ring in rings:
+            ring_counter += 1
+            ring_id = f"RING_{ring_counter:03d}"
+            ring["ring_id"] = ring_id
+            all_rings.append(ring)
+            members = [node_to_idx[m] for m in ring["members"]]
+            account_flags[members] |= flag
+            for idx in members:
+                account_rings[idx].append(ring_id)
+            if flag == FLAG_CYCLE:
+                for idx in members:
+                    account_cycle_lengths[idx].add(ring["cycle_length"])
+
+    # Structural confidence for every ring in one vectorized pass
+    for ring, confidence in zip(all_rings, compute_confidences_batch(all_rings, graph)):
+        ring["structural_confidence"] = confidence
+
+    suspicious_idx = np.flatnonzero(account_flags)
+    if len(suspicious_idx) == 0:
         return _empty_result(graph)
+    sus_list = suspicious_idx.tolist()
+    accounts = [node_ids[i] for i in sus_list]
 
     # ── 2. Velocity check ─────────────────────────────────────────
-    velocity_accounts = _velocity_check(graph)
+    is_velocity = _velocity_mask(graph, node_ids)[suspicious_idx]
 
     # ── 3. Base scores ────────────────────────────────────────────
-    raw_scores: Dict[str, float] = {}
-    for account in suspicious_set:
-        patterns = account_patterns[account]
-        score = 0.0
-        if "cycle" in patterns or any(p.startswith("cycle_length_") for p in patterns):
-            score += WEIGHT_CYCLE
-        if "smurfing" in patterns:
-            score += WEIGHT_SMURF
-        if "shell" in patterns:
-            score += WEIGHT_SHELL
-        if account in velocity_accounts:
-            score += WEIGHT_VELOCITY
-
-        # Interaction bonus
-        distinct_types = set()
-        for p in patterns:
-            if p.startswith("cycle"):
-                distinct_types.add("cycle")
-            elif p == "smurfing":
-                distinct_types.add("smurfing")
-            elif p == "shell":
-                distinct_types.add("shell")
-
-        if len(distinct_types) > 1:
-            score += INTERACTION_BONUS_PER_PATTERN * len(distinct_types)
-        if "cycle" in distinct_types and "smurfing" in distinct_types:
-            score += INTERACTION_BONUS_CYCLE_SMURF
-        if "cycle" in distinct_types and "shell" in distinct_types:
-            score += INTERACTION_BONUS_CYCLE_SHELL
-
-        raw_scores[account] = score
+    # Pattern strings were classified into FLAG_* bits during ring ingestion
+    raw = _base_scores(account_flags[suspicious_idx], is_velocity)
 
     # ── 4. Structural confidence adjustment ───────────────────────
     # Average structural confidence across all rings the account belongs to
-    account_confidence: Dict[str, float] = {}
-    for account in suspicious_set:
-        ring_ids = account_rings.get(account, [])
-        confidences = []
-        for r in all_rings:
-            if r["ring_id"] in ring_ids:
-                confidences.append(r.get("structural_confidence", 0.5))
-        avg_conf = sum(confidences) / len(confidences) if confidences else 0.5
-        account_confidence[account] = avg_conf
-
-    for account in suspicious_set:
-        conf = account_confidence[account]
-        raw_scores[account] *= (0.8 + 0.4 * conf)
+    ring_conf_by_id = {r["ring_id"]: r.get("structural_confidence", 0.5) for r in all_rings}
+    account_confidence = np.empty(len(sus_list), dtype=np.float64)
+    for pos, idx in enumerate(sus_list):
+        # Ring ids were appended in all_rings order; count each ring once
+        confidences = [ring_conf_by_id[rid] for rid in dict.fromkeys(account_rings[idx])]
+        account_confidence[pos] = sum(confidences) / len(confidences) if confidences else 0.5
+    raw *= 0.8 + 0.4 * account_confidence
 
     # ── 5. Density adjustment ─────────────────────────────────────
-    density_adj = compute_density_adjustments(suspicious_set, graph)
-    for account in suspicious_set:
-        raw_scores[account] *= density_adj.get(account, 1.0)
+    density_adj = compute_density_adjustments(set(accounts), graph)
+    raw *= np.fromiter((density_adj.get(a, 1.0) for a in accounts), dtype=np.float64, count=len(accounts))
 
     # ── 6. Percentile normalization ───────────────────────────────
-    sorted_scores = sorted(raw_scores.values())
-    n = len(sorted_scores)
-
-    import bisect
-    final_scores: Dict[str, float] = {}
-    for account in suspicious_set:
-        score = raw_scores[account]
-        # Percentile = fraction of accounts with score <= this score
-        # Use bisect_right for O(log M) instead of linear scan
-        rank = bisect.bisect_right(sorted_scores, score)
-        percentile = rank / n if n > 0 else 0.5
-        multiplier = max(0.85, min(1.15, 0.85 + 0.3 * percentile))
-        final_scores[account] = min(100.0, round(score * multiplier, 1))
-
+    # Percentile = fraction of accounts with score <= this score
+    ranks = np.searchsorted(np.sort(raw), raw, side="right")
+    multiplier = np.clip(0.85 + 0.3 * (ranks / len(accounts)), 0.85, 1.15)
+    # Python round(): np.round scales by 10 first and can differ in the last digit
+    final_scores = [min(100.0, round(score, 1)) for score in (raw * multiplier).tolist()]
 
     # ── 7. Build output ───────────────────────────────────────────
     # Suspicious accounts — sorted descending by score, then by id for determinism
+    order = np.lexsort((suspicious_idx, -np.asarray(final_scores)))
     suspicious_accounts = []
-    for account in sorted(
-        suspicious_set,
-        key=lambda a: (-final_scores[a], a),
-    ):
-        detected = sorted(account_patterns[account])
-        ring_id_list = sorted(set(account_rings.get(account, [])))
-        primary_ring = ring_id_list[0] if ring_id_list else ""
+    for pos in order.tolist():
+        idx = sus_list[pos]
+        flags = int(account_flags[idx])
+        detected = [f"cycle_length_{n}" for n in account_cycle_lengths.get(idx, ())]
+        if flags & FLAG_CYCLE:
+            detected.append("cycle")
+        if flags & FLAG_SMURF:
+            detected.append("smurfing")
+        if flags & FLAG_SHELL:
+            detected.append("shell")
+        ring_id_list = sorted(set(account_rings[idx]))
         suspicious_accounts.append({
-            "account_id": account,
-            "suspicion_score": final_scores[account],
-            "detected_patterns": detected,
-            "ring_id": primary_ring,
+            "account_id": accounts[pos],
+            "suspicion_score": final_scores[pos],
+            "detected_patterns": sorted(detected),
+            "ring_id": ring_id_list[0] if ring_id_list else "",
         })
 
+    raw_by_node = np.zeros(len(node_ids), dtype=np.float64)
+    raw_by_node[suspicious_idx] = raw
+
     # Fraud rings — compute ring risk score, sort descending
     fraud_rings = []
     for ring in all_rings:
-        member_raw = [raw_scores.get(m, 0) for m in ring["members"]]
+        member_raw = raw_by_node[[node_to_idx[m] for m in ring["members"]]].tolist()
         mean_raw = sum(member_raw) / len(member_raw) if member_raw else 0
         ring_risk = round(
             min(100.0, mean_raw * ring.get("structural_confidence", 0.5)),
@@ -201,7 +167,9 @@ def run_scoring_pipeline(
             "risk_score": ring_risk,
         })
 
-    fraud_rings.sort(key=lambda r: (-r["risk_score"], r["ring_id"]))
+    risks = np.fromiter((r["risk_score"] for r in fraud_rings), dtype=np.float64, count=len(fraud_rings))
+    ring_ids = np.array([r["ring_id"] for r in fraud_rings])
+    fraud_rings = [fraud_rings[i] for i in np.lexsort((ring_ids, -risks)).tolist()]
 
     return {
         "suspicious_accounts": suspicious_accounts,
@@ -218,34 +186,85 @@ def run_scoring_pipeline(
 
 # ── Helpers ───────────────────────────────────────────────────────
 
-def _velocity_check(graph: GraphData) -> Set[str]:
-    """Accounts with >5 transactions in any 24-hour window."""
-    velocity_accounts: Set[str] = set()
-    window_delta = timedelta(hours=24)
-
-    for node in graph.all_nodes:
+@njit(cache=True, nogil=True)
+def _base_scores(flags: np.ndarray, is_velocity: np.ndarray) -> np.ndarray:
+    """Pattern weights + interaction bonuses from FLAG_* bits, per account."""
+    has_cycle = (flags & FLAG_CYCLE) != 0
+    has_smurf = (flags & FLAG_SMURF) != 0
+    has_shell = (flags & FLAG_SHELL) != 0
+    distinct = has_cycle.astype(np.int64) + has_smurf.astype(np.int64) + has_shell.astype(np.int64)
+
+    scores = (
+        WEIGHT_CYCLE * has_cycle.astype(np.float64)
+        + WEIGHT_SMURF * has_smurf.astype(np.float64)
+        + WEIGHT_SHELL * has_shell.astype(np.float64)
+        + WEIGHT_VELOCITY * is_velocity.astype(np.float64)
+    )
+    scores += np.where(distinct > 1, INTERACTION_BONUS_PER_PATTERN * distinct, 0)
+    scores += INTERACTION_BONUS_CYCLE_SMURF * (has_cycle & has_smurf).astype(np.float64)
+    scores += INTERACTION_BONUS_CYCLE_SHELL * (has_cycle & has_shell).astype(np.float64)
+    return scores
+
+
+def _velocity_mask(graph: GraphData, node_ids: List[str]) -> np.ndarray:
+    """Per node index: >5 transactions in some 24-hour window."""
+    if graph.csr is not None:
+        return _velocity_mask_csr(graph.csr)
+
+    mask = np.zeros(len(node_ids), dtype=np.bool_)
+    for i, node in enumerate(node_ids):
         # Combine incoming and outgoing transactions
-        txs = graph.adj_list.get(node, []) + graph.reverse_adj_list.get(node, [])
-        if len(txs) <= 5:
+        txs = graph.adj_list.get(node, ()) + graph.reverse_adj_list.get(node, ())
+        if len(txs) <= VELOCITY_MIN_TX:
             continue
+        ts = np.sort(np.fromiter((int(tx.ts_epoch) for tx in txs), dtype=np.int64, count=len(txs)))
+        mask[i] = _max_window_count(ts) > VELOCITY_MIN_TX
+    return mask
+
+
+def _max_window_count(ts: np.ndarray) -> int:
+    """Largest number of sorted int64 epoch seconds within any 24h window."""
+    counts = np.searchsorted(ts, ts + VELOCITY_WINDOW_SECONDS, side="right") - np.arange(len(ts))
+    return int(counts.max())
 
-        timestamps = sorted(tx.timestamp for tx in txs)
-        n_tx = len(timestamps)
-        
-        # Two-pointer sliding window
-        right = 0
-        for left in range(n_tx):
-            # Expand right pointer as long as it's within 24h of the left pointer
-            while right < n_tx and (timestamps[right] - timestamps[left]) <= window_delta:
-                right += 1
-            
-            # If the current window [left, right) has > 5 transactions, flag and move to next node
-            if (right - left) > 5:
-                velocity_accounts.add(node)
-                break
-
-    return velocity_accounts
 
+def _velocity_mask_csr(csr: CSRGraph) -> np.ndarray:
+    """
+    _velocity_mask over the SoA columns in one vectorized pass.
+
+    Every transaction contributes an event to its sender and its receiver.
+    Events are sorted by (node, timestamp) and packed into one monotonic key
+    node * span + (ts - t0), so a single searchsorted finds, for each event,
+    the end of its 24h window without crossing into the next node.
+    """
+    mask = np.zeros(len(csr.node_ids), dtype=np.bool_)
+    if len(csr.ts_epoch) == 0:
+        return mask
+
+    nodes = np.concatenate((csr.sender_idx, csr.receiver_idx)).astype(np.int64)
+    ts = np.concatenate((csr.ts_epoch, csr.ts_epoch))
+    t0 = int(ts.min())
+    span = int(ts.max()) - t0 + VELOCITY_WINDOW_SECONDS + 1
+    if len(csr.node_ids) * span >= np.iinfo(np.int64).max:
+        # Timestamps spread too wide to pack; sort per node instead
+        return _velocity_mask_segments(mask, nodes, ts)
+
+    keys = np.sort(nodes * span + (ts - t0))
+    window_end = np.searchsorted(keys, keys + VELOCITY_WINDOW_SECONDS, side="right")
+    counts = window_end - np.arange(len(keys))
+    mask[keys[counts > VELOCITY_MIN_TX] // span] = True
+    return mask
+
+
+def _velocity_mask_segments(mask: np.ndarray, nodes: np.ndarray, ts: np.ndarray) -> np.ndarray:
+    """Per-node searchsorted fallback for _velocity_mask_csr."""
+    order = np.lexsort((ts, nodes))
+    nodes, ts = nodes[order], ts[order]
+    bounds = np.flatnonzero(np.diff(nodes)) + 1
+    for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(nodes)]):
+        if hi - lo > VELOCITY_MIN_TX and _max_window_count(ts[lo:hi]) > VELOCITY_MIN_TX:
+            mask[nodes[lo]] = True
+    return mask
 
 
 def _empty_result(graph: GraphData) -> dict:
@@ -9,24 +9,43 @@ Rules:
   - Amount consistency: max/min amount ratio ≤ 3.0
   - Minimum transaction amount ≥ 100
   - Post-processing: only keep maximal chains (prune sub-chains)
-  - Depth-limited DFS
+  - Depth-limited DFS: a Numba-jitted iterative kernel over the CSR view
+    when Numba is installed, else an iterative pure-Python DFS over adj_list
   - Structural tightness scoring
+
+RIFT_PARALLEL (see cycle_detector) also fans the compiled search out over
+a thread pool, partitioned by start node; the kernel releases the GIL.
 """
 
 from __future__ import annotations
 
+import math
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from typing import Dict, List, Set, Tuple
 
+import numpy as np
+
+from backend.cycle_detector import _parallel_workers
 from backend.graph_builder import GraphData, Transaction
+from backend.numba_compat import HAS_NUMBA, njit
 
 MIN_PATH_LEN = 3
 MAX_PATH_LEN = 8  # reasonable upper bound for DFS
 INTERMEDIATE_DEGREE_MIN = 2
 INTERMEDIATE_DEGREE_MAX = 3
 MAX_TIME_SPAN_HOURS = 72
+MAX_TIME_SPAN_SECONDS = MAX_TIME_SPAN_HOURS * 3600  # timestamps have whole seconds
 MAX_AMOUNT_RATIO = 3.0
 MIN_TRANSACTION_AMOUNT = 100.0
+MIN_PARALLEL_STARTS = 512  # below this, pool dispatch costs more than it saves
+
+_executor: ThreadPoolExecutor | None = None
+_executor_workers = 0
+# Guards pool creation and task submission across request threads
+_executor_lock = threading.Lock()
 
 
 def detect_shell_chains(graph: GraphData) -> List[dict]:
@@ -42,17 +61,40 @@ def detect_shell_chains(graph: GraphData) -> List[dict]:
           "tightness_score": float,
         }
     """
+    # A chain of MIN_PATH_LEN nodes needs one edge fewer than that
+    if len(graph.all_nodes) < MIN_PATH_LEN or len(graph.transactions) < MIN_PATH_LEN - 1:
+        return []
+
+    if HAS_NUMBA and graph.csr is not None:
+        return _keep_maximal_chains(_detect_chains_csr(graph))
+
     raw_results: List[dict] = []
     seen_paths: Set[tuple] = set()
-
-    # Start from every node
-    for start_node in sorted(graph.all_nodes):
+    # Only these nodes may sit inside a chain (and so be extended past)
+    eligible_mid = frozenset(
+        nid for nid, stats in graph.node_stats.items()
+        if INTERMEDIATE_DEGREE_MIN <= stats.total_degree <= INTERMEDIATE_DEGREE_MAX
+    )
+
+    # Edges below the amount floor can never be on a chain; filter them
+    # once here instead of on every visit from every start
+    outgoing: Dict[str, List[Transaction]] = {}
+    for nid, txs in graph.adj_list.items():
+        kept = [tx for tx in txs if tx.amount >= MIN_TRANSACTION_AMOUNT]
+        if kept:
+            outgoing[nid] = kept
+
+    # Start from every node with a usable outgoing edge
+    for start_node in graph.sorted_nodes:
+        if start_node not in outgoing:
+            continue
         _explore_chains(
             graph=graph,
-            path=[start_node],
-            tx_path=[],
+            start_node=start_node,
             results=raw_results,
             seen_paths=seen_paths,
+            eligible_mid=eligible_mid,
+            outgoing=outgoing,
         )
 
     # Post-process: keep only maximal chains
@@ -61,99 +103,298 @@ def detect_shell_chains(graph: GraphData) -> List[dict]:
     return results
 
 
+def _detect_chains_csr(graph: GraphData) -> List[dict]:
+    """Run the jitted chain kernel over the CSR view and convert rows back to ring dicts."""
+    csr = graph.csr
+    # A chain head needs a first hop the DFS would take: amount above the
+    # floor into a node that may sit mid-chain. np.unique keeps index order,
+    # i.e. lexicographic order, so this matches sorted_nodes.
+    eligible = (csr.degree >= INTERMEDIATE_DEGREE_MIN) & (csr.degree <= INTERMEDIATE_DEGREE_MAX)
+    first_hop = (csr.edge_amount >= MIN_TRANSACTION_AMOUNT) & eligible[csr.neighbors]
+    starts = np.unique(csr.sender_idx[csr.out_edges[first_hop]]).astype(np.int32)
+
+    arrays = (csr.indptr, csr.neighbors, csr.edge_amount, csr.edge_ts, csr.degree)
+    workers = _parallel_workers()
+    if workers > 1 and len(starts) >= MIN_PARALLEL_STARTS:
+        chain_nodes, chain_edges, chain_len, count = _run_kernel_parallel(arrays, starts, workers)
+    else:
+        chain_nodes, chain_edges, chain_len, count = _run_kernel(arrays, starts)
+
+    degree_list = csr.degree.tolist()
+    seen_paths: Set[bytes] = set()
+    results: List[dict] = []
+    # Rows come out in DFS preorder, i.e. the order _explore_chains records them
+    for row in range(count):
+        length = int(chain_len[row])
+        # Parallel edges can produce the same node sequence more than once;
+        # dedup on the raw int32 row before mapping back to string ids
+        path_key = chain_nodes[row, :length].tobytes()
+        if path_key in seen_paths:
+            continue
+        seen_paths.add(path_key)
+        idx_path = chain_nodes[row, :length].tolist()
+        path = [csr.node_ids[i] for i in idx_path]
+        intermediates = idx_path[1:-1]
+        avg_degree = sum(degree_list[i] for i in intermediates) / len(intermediates)
+        results.append({
+            "pattern_type": "shell",
+            "members": path,
+            "transactions": [graph.transactions[csr.out_edges[e]] for e in chain_edges[row, :length - 1]],
+            "path_length": length,
+            "tightness_score": round(1.0 / avg_degree if avg_degree else 1.0, 4),
+        })
+    return results
+
+
+def _run_kernel(arrays: tuple, starts: np.ndarray) -> tuple:
+    """Invoke the chain kernel on a subset of start nodes."""
+    return _chain_kernel(
+        *arrays, starts,
+        MIN_PATH_LEN, MAX_PATH_LEN, MAX_TIME_SPAN_SECONDS, MAX_AMOUNT_RATIO,
+        MIN_TRANSACTION_AMOUNT, INTERMEDIATE_DEGREE_MIN, INTERMEDIATE_DEGREE_MAX,
+    )
+
+
+def _run_kernel_parallel(arrays: tuple, starts: np.ndarray, workers: int) -> tuple:
+    """
+    Split start nodes across a thread pool and merge the rows.
+
+    The kernel releases the GIL (nogil), so threads run it in parallel
+    without copying the CSR arrays to other processes. Searches from
+    different start nodes share no state; a stable sort on each row's start
+    node restores the serial order (rows of one start stay in preorder).
+    Starts are strided since low indices tend to carry the most work.
+    """
+    chunks = [starts[i::workers] for i in range(workers)]
+    with _executor_lock:
+        results = _get_executor(workers).map(_run_kernel, [arrays] * workers, chunks)
+    parts = list(results)
+    nodes = np.concatenate([p_nodes[:count] for p_nodes, _, _, count in parts])
+    edges = np.concatenate([p_edges[:count] for _, p_edges, _, count in parts])
+    lengths = np.concatenate([p_len[:count] for _, _, p_len, count in parts])
+    order = np.argsort(nodes[:, 0], kind="stable")
+    return nodes[order], edges[order], lengths[order], len(order)
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    """Reuse one pool across requests; rebuild only if the size changes. Call with _executor_lock held."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shell")
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the parallel chain search pool, if one was started."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+            _executor_workers = 0
+
+
+@njit(cache=True, nogil=True)
+def _chain_kernel(indptr, neighbors, edge_amount, edge_ts, degree, starts,
+                  min_len, max_len, max_span_seconds, max_ratio,
+                  min_amount, deg_min, deg_max):
+    """
+    Iterative bounded DFS mirroring `_explore_chains`, over int32 CSR arrays.
+
+    An on-path bitmap replaces the `neighbour in path` scan, and running
+    min/max of timestamps and amounts per depth make the span and ratio
+    checks O(1) per edge. Span prunes the subtree; a ratio above max_ratio
+    only grows deeper, so no chain below it validates either. Every valid
+    chain of at least min_len nodes is emitted in DFS preorder, duplicates
+    included; edges are CSR positions padded with -1. Returns
+    (nodes[count, max_len], edges[count, max_len - 1], lengths[count], count).
+    """
+    n = indptr.shape[0] - 1
+    cap = 64
+    out_nodes = np.empty((cap, max_len), np.int32)
+    out_edges = np.full((cap, max_len - 1), -1, np.int32)
+    out_len = np.empty(cap, np.int8)
+    count = 0
+
+    on_path = np.zeros(n, np.int8)
+    path_nodes = np.empty(max_len, np.int32)
+    path_edges = np.empty(max_len, np.int32)
+    cursor = np.empty(max_len, np.int32)
+    min_ts = np.empty(max_len, np.int64)
+    max_ts = np.empty(max_len, np.int64)
+    min_amt = np.empty(max_len, np.float64)
+    max_amt = np.empty(max_len, np.float64)
+
+    for start in starts:
+        path_nodes[0] = start
+        on_path[start] = 1
+        cursor[0] = indptr[start]
+        min_ts[0] = np.iinfo(np.int64).max
+        max_ts[0] = np.iinfo(np.int64).min
+        min_amt[0] = np.inf
+        max_amt[0] = -np.inf
+        depth = 1
+
+        while depth > 0:
+            cur = path_nodes[depth - 1]
+            e = cursor[depth - 1]
+            # Full-length paths and out-of-range intermediates are not extended
+            if (
+                e == indptr[cur + 1]
+                or depth >= max_len
+                or (depth > 1 and not (deg_min <= degree[cur] <= deg_max))
+            ):
+                on_path[cur] = 0
+                depth -= 1
+                continue
+            cursor[depth - 1] = e + 1
+
+            nb = neighbors[e]
+            if on_path[nb] == 1 or edge_amount[e] < min_amount:
+                continue
+            # Too short to record, and nb could not be extended past
+            if depth + 1 < min_len and not (deg_min <= degree[nb] <= deg_max):
+                continue
+            lo_t = min(min_ts[depth - 1], edge_ts[e])
+            hi_t = max(max_ts[depth - 1], edge_ts[e])
+            if hi_t - lo_t > max_span_seconds:
+                continue
+            lo_a = min(min_amt[depth - 1], edge_amount[e])
+            hi_a = max(max_amt[depth - 1], edge_amount[e])
+            if lo_a <= 0 or hi_a / lo_a > max_ratio:
+                continue
+
+            path_edges[depth - 1] = e
+            path_nodes[depth] = nb
+            on_path[nb] = 1
+            cursor[depth] = indptr[nb]
+            min_ts[depth] = lo_t
+            max_ts[depth] = hi_t
+            min_amt[depth] = lo_a
+            max_amt[depth] = hi_a
+            depth += 1
+
+            if depth >= min_len:
+                if count == cap:
+                    cap *= 2
+                    grown_nodes = np.empty((cap, max_len), np.int32)
+                    grown_edges = np.full((cap, max_len - 1), -1, np.int32)
+                    grown_len = np.empty(cap, np.int8)
+                    grown_nodes[:count] = out_nodes[:count]
+                    grown_edges[:count] = out_edges[:count]
+                    grown_len[:count] = out_len[:count]
+                    out_nodes, out_edges, out_len = grown_nodes, grown_edges, grown_len
+                for k in range(depth):
+                    out_nodes[count, k] = path_nodes[k]
+                for k in range(depth - 1):
+                    out_edges[count, k] = path_edges[k]
+                out_len[count] = depth
+                count += 1
+
+    return out_nodes, out_edges, out_len, count
+
+
 def _explore_chains(
     graph: GraphData,
-    path: List[str],
-    tx_path: List[Transaction],
+    start_node: str,
     results: List[dict],
     seen_paths: Set[tuple],
+    eligible_mid: frozenset,
+    outgoing: Dict[str, List[Transaction]],
 ) -> None:
-    """DFS to build acyclic chains with constrained intermediate degrees."""
-    current = path[-1]
-    depth = len(path)
-
-    # Record valid chain if long enough and passes all constraints
-    if depth >= MIN_PATH_LEN:
-        chain_key = tuple(path)
-        if chain_key not in seen_paths:
-            if _validate_chain(tx_path):
-                seen_paths.add(chain_key)
-                tightness = _compute_tightness(graph, path)
-                results.append({
-                    "pattern_type": "shell",
-                    "members": list(path),
-                    "transactions": list(tx_path),
-                    "path_length": len(path),
-                    "tightness_score": round(tightness, 4),
-                })
-
-    if depth >= MAX_PATH_LEN:
-        return
-
-    # Extend
-    outgoing = graph.adj_list.get(current, [])
+    """
+    DFS from `start_node` to build acyclic chains with constrained
+    intermediate degrees.
+
+    Iterative: one iterator over outgoing transactions per path node on an
+    explicit stack, with `path`, `on_path` (O(1) revisit checks) and
+    `tx_path` mutated in place. `bounds` keeps the running (min ts, max ts,
+    min amount, max amount) of the path up to each node, so the span and
+    ratio checks are O(1) per edge. Both only grow along a path, so a
+    failing edge prunes its whole subtree. `eligible_mid` holds the nodes
+    whose degree allows them as intermediates; `outgoing` is the adjacency
+    with sub-minimum amounts already dropped.
+    """
+    path = [start_node]
+    on_path = {start_node}
+    tx_path: List[Transaction] = []
+    bounds = [(math.inf, -math.inf, math.inf, -math.inf)]
+    stack = [iter(outgoing.get(start_node, ()))]
+
+    while stack:
+        tx = next(stack[-1], None)
+        if tx is None:
+            stack.pop()
+            if stack:  # backtrack past the node that owned the iterator
+                tx_path.pop()
+                bounds.pop()
+                on_path.discard(path.pop())
+            continue
 
-    for tx in outgoing:
         neighbour = tx.receiver
+        depth = len(path)
 
         # Acyclic: no revisiting
-        if neighbour in path:
+        if neighbour in on_path:
             continue
 
-        # Minimum amount filter
-        if tx.amount < MIN_TRANSACTION_AMOUNT:
+        # A neighbour that can only end the path is useless before the path
+        # is long enough to record
+        if depth + 1 < MIN_PATH_LEN and neighbour not in eligible_mid:
             continue
 
-        # Intermediate node constraint (the *current* node is intermediate if
-        # it is not the start node)
-        if depth > 1:  # current is an intermediate node
-            stats = graph.node_stats.get(current)
-            if stats is None:
-                continue
-            if not (INTERMEDIATE_DEGREE_MIN <= stats.total_degree <= INTERMEDIATE_DEGREE_MAX):
-                continue
-
-        # Early time pruning
-        candidate_txs = tx_path + [tx]
-        if _time_span_hours(candidate_txs) > MAX_TIME_SPAN_HOURS:
+        # Time span ≤72h and amount ratio ≤3.0, from the running bounds
+        lo_t, hi_t, lo_a, hi_a = bounds[-1]
+        ts, amount = tx.ts_epoch, tx.amount
+        lo_t, hi_t = min(lo_t, ts), max(hi_t, ts)
+        if hi_t - lo_t > MAX_TIME_SPAN_SECONDS:
+            continue
+        lo_a, hi_a = min(lo_a, amount), max(hi_a, amount)
+        if lo_a <= 0 or hi_a / lo_a > MAX_AMOUNT_RATIO:
             continue
 
         path.append(neighbour)
+        on_path.add(neighbour)
         tx_path.append(tx)
-        _explore_chains(graph, path, tx_path, results, seen_paths)
-        tx_path.pop()
-        path.pop()
-
-
-def _validate_chain(txs: List[Transaction]) -> bool:
-    """Check time span ≤72h and amount ratio ≤3.0."""
-    if not txs:
-        return False
-    if _time_span_hours(txs) > MAX_TIME_SPAN_HOURS:
-        return False
-    amounts = [tx.amount for tx in txs]
-    min_a = min(amounts)
-    if min_a <= 0:
-        return False
-    if max(amounts) / min_a > MAX_AMOUNT_RATIO:
-        return False
-    return True
+        bounds.append((lo_t, hi_t, lo_a, hi_a))
+        depth += 1
 
+        # Record the chain if long enough; constraints were checked above
+        if depth >= MIN_PATH_LEN:
+            chain_key = tuple(path)
+            if chain_key not in seen_paths:
+                seen_paths.add(chain_key)
+                tightness = _compute_tightness(graph, path)
+                results.append({
+                    "pattern_type": "shell",
+                    "members": list(path),
+                    "transactions": list(tx_path),
+                    "path_length": depth,
+                    "tightness_score": round(tightness, 4),
+                })
 
-def _time_span_hours(txs: List[Transaction]) -> float:
-    """Total time span of the transaction list in hours."""
-    if not txs:
-        return 0.0
-    timestamps = [tx.timestamp for tx in txs]
-    span = max(timestamps) - min(timestamps)
-    return span.total_seconds() / 3600.0
+        # Extend only below the depth limit and through eligible intermediates
+        if depth < MAX_PATH_LEN and neighbour in eligible_mid:
+            stack.append(iter(outgoing.get(neighbour, ())))
+        else:
+            tx_path.pop()
+            bounds.pop()
+            on_path.discard(path.pop())
 
 
 def _keep_maximal_chains(chains: List[dict]) -> List[dict]:
     """
     Remove sub-chains: if chain A's members are a contiguous subset
     of chain B's members, discard A.
-    Uses a hash set for $O(C)$ complexity instead of $O(C^2)$.
+
+    Kept chains are indexed by each of their edges (consecutive member
+    pairs) with the edge's position, O(L) entries per chain instead of all
+    O(L²) subsequences. A candidate can only sit inside a kept chain at the
+    one place its first edge occurs (chains never repeat a node), so it is
+    compared against just those slices.
     """
     if not chains:
         return []
@@ -162,24 +403,19 @@ def _keep_maximal_chains(chains: List[dict]) -> List[dict]:
     chains.sort(key=lambda c: -c["path_length"])
 
     keep = []
-    covered_subsequences: Set[Tuple[str, ...]] = set()
+    kept_by_edge: Dict[Tuple[str, str], List[Tuple[Tuple[str, ...], int]]] = defaultdict(list)
 
     for chain in chains:
         members = tuple(chain["members"])
-        if members in covered_subsequences:
+        n = len(members)
+        if any(kept[pos:pos + n] == members for kept, pos in kept_by_edge.get(members[:2], ())):
             # This chain is already a sub-chain of a previously kept (longer) chain
             continue
 
         # Keep this chain
         keep.append(chain)
-
-        # Add all contiguous subsequences of this chain to the covered set
-        # Chain max length is 5, so n(n+1)/2 = 15 subsequences per chain
-        n = len(members)
-        for length in range(2, n + 1):
-            for start in range(n - length + 1):
-                sub = members[start:start + length]
-                covered_subsequences.add(sub)
+        for pos in range(n - 1):
+            kept_by_edge[members[pos:pos + 2]].append((members, pos))
 
     return keep
 
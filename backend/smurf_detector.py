@@ -12,15 +12,17 @@ Rules:
 
 from __future__ import annotations
 
-import math
-from collections import defaultdict
-from datetime import timedelta
-from typing import Dict, List, Set
+from operator import attrgetter
+from typing import Dict, List, Sequence, Set
+
+import numpy as np
 
 from backend.graph_builder import GraphData, Transaction
+from backend.numba_compat import HAS_NUMBA, njit
 
 MIN_COUNTERPARTIES = 10
 WINDOW_HOURS = 72
+WINDOW_SECONDS = WINDOW_HOURS * 3600  # timestamps have whole seconds
 DIVERSITY_THRESHOLD = 0.7
 VARIANCE_THRESHOLD = 0.5
 VARIANCE_DAMPEN = 0.70  # multiply score by this when variance > threshold
@@ -42,21 +44,28 @@ def detect_smurfing(graph: GraphData) -> List[dict]:
           "dampened": bool,
         }
     """
+    # Every hub needs MIN_COUNTERPARTIES transactions on one side
+    if len(graph.transactions) < MIN_COUNTERPARTIES:
+        return []
+
+    if HAS_NUMBA and graph.csr is not None:
+        return _detect_smurfing_csr(graph)
+
     results: List[dict] = []
     checked: Set[str] = set()
 
-    for node in sorted(graph.all_nodes):
+    for node in graph.sorted_nodes:
         if node in checked:
             continue
 
         # ── Fan-out (node → many) ──
-        out_txs = graph.adj_list.get(node, [])
+        out_txs = _sorted_by_time(graph, node, "fan_out")
         fan_out_result = _check_fan(node, out_txs, direction="fan_out")
         if fan_out_result:
             results.append(fan_out_result)
 
         # ── Fan-in (many → node) ──
-        in_txs = graph.reverse_adj_list.get(node, [])
+        in_txs = _sorted_by_time(graph, node, "fan_in")
         fan_in_result = _check_fan(node, in_txs, direction="fan_in")
         if fan_in_result:
             results.append(fan_in_result)
@@ -68,29 +77,97 @@ def detect_smurfing(graph: GraphData) -> List[dict]:
 
 # ── Private helpers ───────────────────────────────────────────────
 
+def _detect_smurfing_csr(graph: GraphData) -> List[dict]:
+    """
+    Run the window search for every hub in one jitted call over the CSR's
+    time-sorted edge lists, then build ring dicts for the hubs that hit.
+    """
+    csr = graph.csr
+    out_bounds = _hub_windows_kernel(
+        csr.indptr, csr.out_by_time, csr.receiver_idx, csr.ts_epoch,
+        WINDOW_SECONDS, MIN_COUNTERPARTIES,
+    )
+    in_bounds = _hub_windows_kernel(
+        csr.in_indptr, csr.in_by_time, csr.sender_idx, csr.ts_epoch,
+        WINDOW_SECONDS, MIN_COUNTERPARTIES,
+    )
+
+    transactions = graph.transactions
+    node_ids = csr.node_ids
+    sides = (
+        ("fan_out", out_bounds, csr.indptr, csr.out_by_time, csr.receiver_idx),
+        ("fan_in", in_bounds, csr.in_indptr, csr.in_by_time, csr.sender_idx),
+    )
+    results: List[dict] = []
+    # Node indices are in sorted_nodes order; fan-out before fan-in per hub
+    for idx in np.flatnonzero((out_bounds[:, 0] >= 0) | (in_bounds[:, 0] >= 0)).tolist():
+        hub = node_ids[idx]
+        for direction, bounds, indptr, by_time, other_idx in sides:
+            lo, hi = bounds[idx].tolist()
+            if lo < 0:
+                continue
+            edges = by_time[indptr[idx] + lo:indptr[idx] + hi]
+            window_txs = [transactions[i] for i in edges.tolist()]
+            counterparties = {node_ids[c] for c in other_idx[edges].tolist()}
+            results.append(_fan_result(hub, direction, window_txs, counterparties))
+    return results
+
+
+def _sorted_by_time(graph: GraphData, node: str, direction: str) -> Sequence[Transaction]:
+    """
+    The hub's outgoing (fan_out) or incoming (fan_in) transactions in
+    timestamp order, ties in transaction order. Read from the CSR's
+    pre-sorted edge lists when available; too-short lists are not sorted.
+    """
+    csr = graph.csr
+    if csr is None:
+        adj = graph.adj_list if direction == "fan_out" else graph.reverse_adj_list
+        txs = adj.get(node, ())
+        if len(txs) < MIN_COUNTERPARTIES:
+            return txs
+        return sorted(txs, key=attrgetter("ts_epoch"))
+
+    idx = csr.node_to_idx[node]
+    if direction == "fan_out":
+        indptr, by_time = csr.indptr, csr.out_by_time
+    else:
+        indptr, by_time = csr.in_indptr, csr.in_by_time
+    lo, hi = indptr[idx], indptr[idx + 1]
+    if hi - lo < MIN_COUNTERPARTIES:
+        return ()
+    transactions = graph.transactions
+    return [transactions[i] for i in by_time[lo:hi].tolist()]
+
+
 def _check_fan(
     hub: str,
-    txs: List[Transaction],
+    sorted_txs: Sequence[Transaction],
     direction: str,
 ) -> dict | None:
-    """Check if a hub account's transactions meet the smurfing criteria."""
-    if len(txs) < MIN_COUNTERPARTIES:
+    """Check if a hub account's timestamp-sorted transactions meet the smurfing criteria."""
+    if len(sorted_txs) < MIN_COUNTERPARTIES:
         return None
 
-    # Sort by timestamp for sliding window
-    sorted_txs = sorted(txs, key=lambda t: t.timestamp)
-
     best_window = _best_sliding_window(sorted_txs, direction)
     if best_window is None:
         return None
 
     window_txs, counterparties = best_window
+    return _fan_result(hub, direction, window_txs, counterparties)
 
+
+def _fan_result(
+    hub: str,
+    direction: str,
+    window_txs: List[Transaction],
+    counterparties: Set[str],
+) -> dict:
+    """Score a hub's best window and build its smurfing ring dict."""
     # Diversity score
     diversity = len(counterparties) / len(window_txs) if window_txs else 0.0
 
     # Variance ratio
-    amounts = [tx.amount for tx in window_txs]
+    amounts = np.fromiter((tx.amount for tx in window_txs), dtype=np.float64, count=len(window_txs))
     variance_ratio = _variance_ratio(amounts)
 
     dampened = False
@@ -123,53 +200,157 @@ def _best_sliding_window(
 ) -> tuple | None:
     """
     Find the 72-hour window with the most distinct counterparties.
-    Uses a two-pointer sliding window ($O(N)$) for efficiency.
+
+    Window ends for every left edge come from one searchsorted over the
+    int64 epoch seconds; hubs with too few distinct counterparties overall
+    are rejected before any scan. A two-pointer pass then tracks distinct
+    counterparties with an int-indexed count list (counterparties interned
+    to ints) instead of a dict of strings. With Numba the pass runs in
+    _window_kernel.
     Returns (window_txs, counterparties) or None.
     """
     if not sorted_txs:
         return None
 
-    window_delta = timedelta(hours=WINDOW_HOURS)
-    best_txs = None
-    best_counterparties: Set[str] = set()
-
     n = len(sorted_txs)
-    right = 0
-    # Track counterparties in the current window and their counts
-    current_cp_counts: Dict[str, int] = defaultdict(int)
+    ts = np.fromiter((tx.ts_epoch for tx in sorted_txs), dtype=np.int64, count=n)
+
+    get_cp = attrgetter("receiver" if direction == "fan_out" else "sender")
+    names = list(map(get_cp, sorted_txs))
+    interned: Dict[str, int] = {}
+    cps = [interned.setdefault(name, len(interned)) for name in names]
+    # Too few counterparties overall: no window can reach the threshold
+    if len(interned) < MIN_COUNTERPARTIES:
+        return None
 
+    if HAS_NUMBA:
+        lo, hi = _window_kernel(
+            ts, np.array(cps, dtype=np.int32), len(interned), WINDOW_SECONDS, MIN_COUNTERPARTIES
+        )
+        if lo < 0:
+            return None
+        return sorted_txs[lo:hi], set(names[lo:hi])
+
+    rights = np.searchsorted(ts, ts + WINDOW_SECONDS, side="right").tolist()
+    counts = [0] * len(interned)
+
+    best_distinct = 0
+    best_bounds = None
+    distinct = 0
+    right = 0
     for left in range(n):
+        # No later window can beat the best: it holds at most n - left
+        # transactions and at most every counterparty once
+        if best_distinct >= min(n - left, len(interned)):
+            break
+
         # Expand right boundary
-        while right < n and (sorted_txs[right].timestamp - sorted_txs[left].timestamp) <= window_delta:
-            cp = sorted_txs[right].receiver if direction == "fan_out" else sorted_txs[right].sender
-            current_cp_counts[cp] += 1
+        stop = rights[left]
+        while right < stop:
+            cp = cps[right]
+            if counts[cp] == 0:
+                distinct += 1
+            counts[cp] += 1
             right += 1
 
         # Check if current window is the best
-        if len(current_cp_counts) >= MIN_COUNTERPARTIES:
-            if len(current_cp_counts) > len(best_counterparties):
-                best_txs = sorted_txs[left:right]
-                best_counterparties = set(current_cp_counts.keys())
+        if distinct >= MIN_COUNTERPARTIES and distinct > best_distinct:
+            best_distinct = distinct
+            best_bounds = (left, right)
 
         # Shrink left boundary: remove left-most transaction
-        cp_left = sorted_txs[left].receiver if direction == "fan_out" else sorted_txs[left].sender
-        current_cp_counts[cp_left] -= 1
-        if current_cp_counts[cp_left] == 0:
-            del current_cp_counts[cp_left]
+        cp = cps[left]
+        counts[cp] -= 1
+        if counts[cp] == 0:
+            distinct -= 1
 
-    if best_txs is None:
+    if best_bounds is None:
         return None
-    return best_txs, best_counterparties
+    lo, hi = best_bounds
+    return sorted_txs[lo:hi], set(names[lo:hi])
+
 
+@njit(cache=True, nogil=True)
+def _window_kernel(ts, cps, n_cps, window_seconds, min_cps):
+    """
+    Two-pointer pass of _best_sliding_window over int arrays.
+
+    Returns (lo, hi) of the first window with the most distinct
+    counterparties (at least min_cps), or (-1, -1).
+    """
+    n = ts.shape[0]
+    counts = np.zeros(n_cps, dtype=np.int32)
+    best_distinct = 0
+    best_lo = -1
+    best_hi = -1
+    distinct = 0
+    right = 0
+    for left in range(n):
+        if best_distinct >= min(n - left, n_cps):
+            break
+
+        limit = ts[left] + window_seconds
+        while right < n and ts[right] <= limit:
+            cp = cps[right]
+            if counts[cp] == 0:
+                distinct += 1
+            counts[cp] += 1
+            right += 1
 
+        if distinct >= min_cps and distinct > best_distinct:
+            best_distinct = distinct
+            best_lo = left
+            best_hi = right
 
-def _variance_ratio(amounts: List[float]) -> float:
-    """std(amounts) / mean(amounts), guarded against div-by-zero."""
-    if not amounts or len(amounts) < 2:
+        cp = cps[left]
+        counts[cp] -= 1
+        if counts[cp] == 0:
+            distinct -= 1
+
+    return best_lo, best_hi
+
+
+def _variance_ratio(amounts: np.ndarray) -> float:
+    """std(amounts) / mean(amounts) (population std), guarded against div-by-zero."""
+    if len(amounts) < 2:
         return 0.0
-    mean = sum(amounts) / len(amounts)
+    mean = amounts.mean()
     if mean == 0:
         return 0.0
-    variance = sum((a - mean) ** 2 for a in amounts) / len(amounts)
-    std = math.sqrt(variance)
-    return std / mean
+    return float(amounts.std() / mean)
+
+
+@njit(cache=True, nogil=True)
+def _hub_windows_kernel(indptr, by_time, other_idx, ts_epoch, window_seconds, min_cps):
+    """
+    _window_kernel for every node's time-sorted edge slice in one call.
+
+    Counterparties are interned per hub through a shared node-indexed
+    array that is reset after each slice. Returns int64[n, 2] window
+    bounds relative to the slice start, (-1, -1) where no window qualifies.
+    """
+    n = indptr.shape[0] - 1
+    bounds = np.full((n, 2), -1, dtype=np.int64)
+    local_id = np.full(n, -1, dtype=np.int32)
+    for node in range(n):
+        start = indptr[node]
+        stop = indptr[node + 1]
+        if stop - start < min_cps:
+            continue
+        edges = by_time[start:stop]
+        cps = np.empty(stop - start, dtype=np.int32)
+        n_cps = 0
+        for k in range(stop - start):
+            other = other_idx[edges[k]]
+            if local_id[other] < 0:
+                local_id[other] = n_cps
+                n_cps += 1
+            cps[k] = local_id[other]
+        for k in range(stop - start):
+            local_id[other_idx[edges[k]]] = -1
+        if n_cps < min_cps:
+            continue
+        lo, hi = _window_kernel(ts_epoch[edges], cps, n_cps, window_seconds, min_cps)
+        bounds[node, 0] = lo
+        bounds[node, 1] = hi
+    return bounds
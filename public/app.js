@@ -673,7 +673,7 @@ function buildGraph(data) {
             source: e.source,
             target: e.target,
             amount: e.amount,
-            timestamp: e.timestamp,
+            timestamp_ms: e.timestamp_ms,
             label: `$${e.amount.toLocaleString()}`,
         }
     }));
@@ -1230,10 +1230,10 @@ function applyPatternMode(mode) {
 // ═══════════════════════════════════════════════════════════════
 
 function setupTimeTravel(data) {
-    const edges = data.graph_data.edges.filter(e => e.timestamp);
+    const edges = data.graph_data.edges.filter(e => e.timestamp_ms != null);
     if (edges.length === 0) return;
 
-    const timestamps = edges.map(e => new Date(e.timestamp).getTime()).sort((a, b) => a - b);
+    const timestamps = edges.map(e => e.timestamp_ms).sort((a, b) => a - b);
     const minTime = timestamps[0];
     const maxTime = timestamps[timestamps.length - 1];
 
@@ -1256,7 +1256,7 @@ function setupTimeTravel(data) {
             $('#timeCurrent').textContent = date.toLocaleString();
 
             State.cy.edges().forEach(edge => {
-                const ts = new Date(edge.data('timestamp')).getTime();
+                const ts = edge.data('timestamp_ms');
                 edge.toggleClass('hidden-node', ts > cutoff);
             });
         }
@@ -1339,10 +1339,10 @@ function buildLocalAccountData(accountId) {
     }
 
     const outgoing = d.graph_data.edges.filter(e => e.source === accountId).map(e => ({
-        transaction_id: e.transaction_id, to: e.target, amount: e.amount, timestamp: e.timestamp
+        transaction_id: e.transaction_id, to: e.target, amount: e.amount, timestamp_ms: e.timestamp_ms
     }));
     const incoming = d.graph_data.edges.filter(e => e.target === accountId).map(e => ({
-        transaction_id: e.transaction_id, from: e.source, amount: e.amount, timestamp: e.timestamp
+        transaction_id: e.transaction_id, from: e.source, amount: e.amount, timestamp_ms: e.timestamp_ms
     }));
 
     return {
@@ -1418,11 +1418,11 @@ function renderAccountDetail(data, container) {
 
     // Outgoing Transactions
     if (data.outgoing_transactions.length > 0) {
-        html += `<div class="account-section"><h4>Outgoing Transactions (${data.outgoing_transactions.length})</h4><div class="tx-list">`;
+        html += `<div class="account-section"><h4>Outgoing Transactions (${data.stats.out_degree ?? data.outgoing_transactions.length})</h4><div class="tx-list">`;
         data.outgoing_transactions.forEach(tx => {
             html += `<div class="tx-item">
         <div><span class="tx-item-id">${tx.transaction_id}</span><br><span class="tx-item-account">→ ${tx.to}</span></div>
-        <div style="text-align:right"><span class="tx-item-amount">$${tx.amount.toLocaleString()}</span><br><span class="tx-item-time">${formatTimestamp(tx.timestamp)}</span></div>
+        <div style="text-align:right"><span class="tx-item-amount">$${tx.amount.toLocaleString()}</span><br><span class="tx-item-time">${formatTimestamp(tx.timestamp_ms)}</span></div>
       </div>`;
         });
         html += `</div></div>`;
@@ -1430,11 +1430,11 @@ function renderAccountDetail(data, container) {
 
     // Incoming Transactions
     if (data.incoming_transactions.length > 0) {
-        html += `<div class="account-section"><h4>Incoming Transactions (${data.incoming_transactions.length})</h4><div class="tx-list">`;
+        html += `<div class="account-section"><h4>Incoming Transactions (${data.stats.in_degree ?? data.incoming_transactions.length})</h4><div class="tx-list">`;
         data.incoming_transactions.forEach(tx => {
             html += `<div class="tx-item">
         <div><span class="tx-item-id">${tx.transaction_id}</span><br><span class="tx-item-account">← ${tx.from}</span></div>
-        <div style="text-align:right"><span class="tx-item-amount">$${tx.amount.toLocaleString()}</span><br><span class="tx-item-time">${formatTimestamp(tx.timestamp)}</span></div>
+        <div style="text-align:right"><span class="tx-item-amount">$${tx.amount.toLocaleString()}</span><br><span class="tx-item-time">${formatTimestamp(tx.timestamp_ms)}</span></div>
       </div>`;
         });
         html += `</div></div>`;
@@ -1452,7 +1452,7 @@ function renderAccountDetail(data, container) {
 }
 
 function formatTimestamp(ts) {
-    if (!ts) return '';
+    if (ts == null) return '';
     const d = new Date(ts);
     return d.toLocaleString('en-US', { month: 'short', day: 'numeric', hour: '2-digit', minute: '2-digit' });
 }
@@ -0,0 +1,35 @@
+"""Invalid uploads large enough to roll to disk are rejected with 422, not 500."""
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+# Starlette spools uploads to disk beyond 1 MB; stay well above that
+SPOOL_BYTES = 2 * 1024 * 1024
+
+
+def _post(payload: bytes):
+    return client.post("/analyze", files={"file": ("big.csv", payload, "text/csv")})
+
+
+def test_too_many_transactions_on_disk_is_422():
+    header = b"transaction_id,sender_id,receiver_id,amount,timestamp\n"
+    row = b"T%d,ACC_%05d,ACC_%05d,100.00,2025-01-01 00:00:00\n"
+    rows = [row % (i, i, i + 1) for i in range(40_000)]
+    payload = header + b"".join(rows)
+    assert len(payload) > SPOOL_BYTES
+
+    response = _post(payload)
+    assert response.status_code == 422
+    assert "exceeds maximum" in response.json()["detail"]
+
+
+def test_missing_columns_on_disk_is_422():
+    payload = b"transaction_id,sender_id,amount\n" + b"T1,A,1\n" * (SPOOL_BYTES // 7)
+    assert len(payload) > SPOOL_BYTES
+
+    response = _post(payload)
+    assert response.status_code == 422
+    assert "Missing required columns" in response.json()["detail"]